@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.core.config import get_config
+from app.core.database import ASYNC_ENGINE, REPLICAS, SessionReleasingRoute
+from app.core.metrics import DB_POOL_CHECKOUT_WAIT, DB_CONN_HOLD
+from app.dependencies.auth import get_current_admin
+from app.schemas.admin import PoolReport, PoolStats
+from app.schemas.bulk_import import ImportReport
+from app.schemas.auth import CurrentUser
+from app.services.export_service import ExportService, get_export_service
+from app.services.import_service import ImportService, get_import_service, iter_lines
+
+router = APIRouter(route_class=SessionReleasingRoute)
+
+config = get_config()
+
+
+def _pool_stats(name: str, engine) -> PoolStats:
+    pool = engine.sync_engine.pool
+    return PoolStats(
+        name=name,
+        size=pool.size(),
+        checked_out=pool.checkedout(),
+        checked_in=pool.checkedin(),
+        overflow=max(pool.overflow(), 0),
+        max_overflow=config.DB_MAX_OVERFLOW,
+        timeout=pool.timeout(),
+        recycle=config.DB_POOL_RECYCLE,
+        pre_ping=config.DB_POOL_PRE_PING,
+    )
+
+
+@router.get("/pool", response_model=PoolReport)
+async def pool_status(admin: CurrentUser = Depends(get_current_admin)):
+    """커넥션 풀 현재 상태(사용 중/idle/overflow)와 checkout 대기 시간 분포"""
+    pools = [_pool_stats("primary", ASYNC_ENGINE)]
+    pools += [_pool_stats(f"replica-{i}", engine) for i, engine in enumerate(REPLICAS.engines)]
+    return PoolReport(
+        pools=pools,
+        checkout_wait=DB_POOL_CHECKOUT_WAIT.snapshot(),
+        connection_hold=DB_CONN_HOLD.snapshot(),
+    )
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_questions(batch_size: int = Query(1000, gt=0, le=10000),
+                           export_service: ExportService = Depends(get_export_service),
+                           admin: CurrentUser = Depends(get_current_admin)):
+    """질문/답변/추천 수 전체를 NDJSON(질문 한 줄에 답변 포함)으로 스트리밍한다. (manage.py export 와 같은 형식)
+    GET 이므로 복제본이 있으면 복제본에서 읽는다. 세션은 전송이 끝난 뒤 get_db 종료 시점에 반환된다."""
+    filename = f"questions-{datetime.now(timezone.utc):%Y%m%d%H%M%S}.ndjson"
+    return StreamingResponse(export_service.export_ndjson(batch_size),
+                             media_type="application/x-ndjson",
+                             headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+
+@router.post("/import", response_model=ImportReport)
+async def import_ndjson(request: Request,
+                        batch_size: int = Query(1000, gt=0, le=10000),
+                        skip_lines: int = Query(0, ge=0),
+                        import_service: ImportService = Depends(get_import_service),
+                        admin: CurrentUser = Depends(get_current_admin)):
+    """요청 본문의 NDJSON(사용자/질문+답변, app/schemas/bulk_import.py)을 batch_size 줄씩 가져온다.
+    본문은 스트림으로 읽으므로 파일 크기와 무관하게 메모리가 일정하다.
+    중단(aborted)됐으면 원인을 고친 뒤 같은 파일을 skip_lines=committed_lines 로 다시 보낸다."""
+    return await import_service.import_ndjson(iter_lines(request.stream()), batch_size=batch_size,
+                                              skip_lines=skip_lines)
@@ -1,53 +1,73 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Response, Form, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, Response, Form, UploadFile, File, Request
 from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_db, SessionReleasingRoute
 from app.dependencies.auth import get_current_user
-from app.models.user import User
+from app.schemas.auth import CurrentUser
 from app.schemas import answer as schema_answer
 from app.schemas.answer import AnswerOut
+from app.schemas.vote import VoteOut
 from app.services.answer_service import AnswerService, get_answer_service
-from app.services.question_service import QuestionService, get_question_service
+from app.services.question_service import VersionConflictError
+from app.utils.etag import etag_matches
+from app.utils.serialization import json_response
 
-router = APIRouter()
+router = APIRouter(route_class=SessionReleasingRoute)
 
 @router.post("/post/{question_id}", response_model=schema_answer.AnswerOut,)
 async def answer_create(question_id: int,
                         answer_in: schema_answer.AnswerIn,
-                        question_service: QuestionService = Depends(get_question_service),
                         answer_service: AnswerService = Depends(get_answer_service),
-                        current_user: User = Depends(get_current_user)) -> schema_answer.AnswerOut:
-    question = await question_service.get_question(question_id)
-    if question is None:
+                        current_user: CurrentUser = Depends(get_current_user)) -> schema_answer.AnswerOut:
+    # 질문 존재 확인은 서비스의 카운터 UPDATE(rowcount)로 한다. (질문 그래프를 미리 읽지 않음)
+    created_answer = await answer_service.create_answer(question_id, answer_in, current_user)
+    if created_answer is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="해당 질문을 찾을 수 없습니다."
         )
-    created_answer = await answer_service.create_answer(question, answer_in, current_user)
-    return created_answer # ORM 객체를 그대로 반환해도 Pydantic이 변환해 줍니다.
+    return json_response(AnswerOut, created_answer) # 이미 AnswerOut 이므로 재검증 없이 직렬화
 
 
 @router.get("/detail/{answer_id}", response_model=AnswerOut)
 async def get_answer(answer_id: int,
+                     request: Request,
                      answer_service: AnswerService = Depends(get_answer_service)):
+    """ETag 를 내려주고, If-None-Match 가 일치하면 AnswerOut 을 만들지 않고 304 로 응답한다."""
+    etag = await answer_service.get_answer_etag(answer_id)
+    if etag is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="해당 게시글을 찾을 수 없습니다."
+        )
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
     answer = await answer_service.get_answer(answer_id)
     if answer is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="해당 게시글을 찾을 수 없습니다."
         )
-    return answer
+    # 캐시는 하되 매번 ETag 로 재검증
+    return json_response(AnswerOut, answer, headers={"ETag": etag, "Cache-Control": "no-cache"})
 
 
 @router.put("/update/{answer_id}",
-            response_model = schema_answer.AnswerOut)
+            response_model = schema_answer.AnswerUpdateOut)
 async def update_answer(answer_id: int,
                         answer_in: schema_answer.AnswerIn,
                         answer_service: AnswerService = Depends(get_answer_service),
-                        current_user: User = Depends(get_current_user)):
-    answer = await answer_service.update_answer(answer_id, answer_in, current_user)
+                        current_user: CurrentUser = Depends(get_current_user)):
+    try:
+        answer = await answer_service.update_answer(answer_id, answer_in, current_user)
+    except VersionConflictError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="다른 곳에서 먼저 수정되었습니다. 새로고침 후 다시 시도해주세요."
+        )
     if answer is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -58,15 +78,14 @@ async def update_answer(answer_id: int,
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Not authorized: 접근 권한이 없습니다."
         )
-    # return answer
-    # ORM -> Pydantic 변환
-    return schema_answer.AnswerOut.model_validate(answer, from_attributes=True)
+    # 서비스가 만든 AnswerUpdateOut 을 재검증 없이 그대로 직렬화
+    return json_response(schema_answer.AnswerUpdateOut, answer)
 
 
 @router.delete("/delete/{answer_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_answer(answer_id: int,
                          answer_service: AnswerService = Depends(get_answer_service),
-                         current_user: User = Depends(get_current_user)):
+                         current_user: CurrentUser = Depends(get_current_user)):
     answer = await answer_service.delete_answer(answer_id, current_user)
     if answer is None:
         raise HTTPException(
@@ -82,13 +101,14 @@ async def delete_answer(answer_id: int,
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
-@router.post("/vote/{answer_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.post("/vote/{answer_id}", response_model=VoteOut)
 async def answer_vote(answer_id: int,
                 answer_service: AnswerService = Depends(get_answer_service),
-                current_user: User = Depends(get_current_user)):
-    answer = await answer_service.get_answer(answer_id)
-    if not answer:
+                current_user: CurrentUser = Depends(get_current_user)):
+    # 존재 확인/작성자 확인/중복 확인을 서비스의 조건부 INSERT 한 문장으로 처리한다.
+    vote = await answer_service.vote_answer(answer_id, current_user)
+    if vote is None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                             detail="데이터를 찾을수 없습니다.")
-    await answer_service.vote_answer(answer_id, current_user)
-    return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+    # recorded=False: 본인 글이거나 이미 추천함 (요청은 멱등하게 성공)
+    return json_response(VoteOut, vote)
\ No newline at end of file
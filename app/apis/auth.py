@@ -1,13 +1,15 @@
 from datetime import timedelta, datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from jose import jwt
 
+from app.core.database import SessionReleasingRoute
+from app.core.hashing import HashingPoolBusyError
 from app.schemas.auth import TokenResponse, LoginRequest
 from app.services.auth_service import AuthService, get_auth_service, InvalidPasswordError, UserNotFoundError, EmptyFieldError
 
-router = APIRouter()
+router = APIRouter(route_class=SessionReleasingRoute)
 
 
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24
@@ -18,7 +20,6 @@ ALGORITHM = "HS256"
 async def login(form_data: OAuth2PasswordRequestForm = Depends(),
           auth_service: AuthService = Depends(get_auth_service)):
     # OAuth2 폼 데이터를 LoginRequest로 변환
-    print("login_for_access_token form_data: ", form_data)
     """ # 아래 처럼 수정
     login_data = LoginRequest(
         email=form_data.username,  # 내가 수정: email 이지만 OAuth2PasswordRequestForm이 username으로 받기때문에 임시 방편으로 사용하고 있다.
@@ -61,10 +62,18 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(),
             detail="가입된 이메일이 없습니다.",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    except HashingPoolBusyError:
+        # 해싱 풀 대기열이 가득 참: 기다리게 하지 않고 바로 재시도를 안내한다.
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="요청이 많아 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": "1"},
+        )
 
     # make access token
     data = {
         "sub": user.username,
+        "ver": user.token_version,
         "exp": datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     }
     access_token = jwt.encode(data, SECRET_KEY, algorithm=ALGORITHM)
@@ -1,75 +1,231 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Response, Form, UploadFile, File, Query
+import asyncio
+from typing import List, Literal
+from fastapi import APIRouter, Depends, HTTPException, status, Response, Form, UploadFile, File, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import get_config
+from app.core.database import SessionReleasingRoute
+from app.core.pubsub import pubsub
 from app.dependencies.auth import get_current_user
-from app.models.user import User
+from app.schemas.auth import CurrentUser
 from app.schemas import question as schema_question
-from app.schemas.question import QuestionOut
-from app.services.question_service import QuestionService, get_question_service
+from app.schemas.answer import AnswerOut, AnswerList, AnswerSort
+from app.schemas.question import QuestionOut, QuestionDetailOut
+from app.schemas.search import SearchResult
+from app.schemas.vote import VoteOut
+from app.services.question_service import QuestionService, get_question_service, VersionConflictError, question_cursor, \
+    question_topic
+from app.services.answer_service import AnswerService, get_answer_service
+from app.services.search_service import SearchService, get_search_service
+from app.utils.etag import etag_matches, make_etag
+from app.utils.pagination import InvalidCursorError
+from app.utils.serialization import json_response, get_adapter
 
-router = APIRouter()
+router = APIRouter(route_class=SessionReleasingRoute)
+
+config = get_config()
 
 @router.post("/post", response_model=schema_question.QuestionOut,)
 async def question_create(question_in: schema_question.QuestionIn,
                           question_service: QuestionService = Depends(get_question_service),
-                          current_user: User = Depends(get_current_user)) -> schema_question.QuestionOut:
+                          current_user: CurrentUser = Depends(get_current_user)) -> schema_question.QuestionOut:
     created_question = await question_service.create_question(question_in, current_user)
-    return created_question # ORM 객체를 그대로 반환해도 Pydantic이 변환해 줍니다.
+    return json_response(QuestionOut, created_question) # 이미 QuestionOut 이므로 재검증 없이 직렬화
 
 
-@router.get("/all", response_model=schema_question.QuestionList)
+@router.get("/all", response_model=schema_question.QuestionSummaryList | schema_question.QuestionList)
 async def question_all(question_service: QuestionService = Depends(get_question_service),
                        page: int = Query(0, ge=0),
                        size: int = Query(10, gt=0),
                        response: Response = None,
-                       keyword: str | None = None
-                       ) -> dict:
-    total, question_list = await question_service.get_questions(skip=page * size, limit=size, keyword=keyword)
-    if question_list is None:
+                       keyword: str | None = None,
+                       cursor: str | None = None,
+                       include_total: bool = True,
+                       view: Literal["summary", "full"] = "summary",
+                       sort: schema_question.QuestionSort = "recent",
+                       ):
+    """
+    - page/size: 기존 OFFSET 페이징 (Home.svelte 페이저)
+    - cursor: 키셋 페이징. 첫 페이지는 cursor= (빈 문자열), 이후에는 응답의 next_cursor 를 그대로 넘긴다.
+      이 경우 page는 무시된다.
+    - include_total=false: 전체 건수(count) 쿼리를 생략한다. total은 None으로 내려간다.
+    - view=summary(기본): QuestionSummary(제목, 작성자명, 작성일, 답변수, 추천수)만 내려준다.
+      view=full: 답변/추천자 목록까지 포함한 QuestionOut (이전 응답 형식)
+    - sort=recent(기본, 등록순) | votes(추천순) | activity(최근 활동순). 커서는 같은 sort 로만 이어 읽는다.
+    """
+    summary = view == "summary"
+    if cursor is not None:
+        try:
+            question_list, next_cursor = await question_service.get_questions_by_cursor(cursor=cursor, limit=size, keyword=keyword,
+                                                                                        summary=summary, sort=sort)
+        except InvalidCursorError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="잘못된 커서입니다."
+            )
+        total = await question_service.count_questions(keyword) if include_total else None
+    else:
+        total, question_list = await question_service.get_questions(skip=page * size, limit=size, keyword=keyword,
+                                                                     with_total=include_total, summary=summary,
+                                                                     sort=sort)
+        if question_list is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="등록된 게시물이 없습니다."
+            )
+
+        # OFFSET 페이지에서도 다음 페이지 커서를 내려주어, 클라이언트가 커서 모드로 넘어갈 수 있게 한다.
+        next_cursor = None
+        if len(question_list) == size:
+            next_cursor = question_cursor(question_list[-1], sort)
+
+    if summary:
+        # question_list 는 이미 QuestionSummary 로 검증된 상태라 다시 검증하지 않고 바로 직렬화한다.
+        return json_response(schema_question.QuestionSummaryList,
+                             schema_question.QuestionSummaryList.model_construct(
+                                 total=total, question_list=question_list, next_cursor=next_cursor))
+    return json_response(schema_question.QuestionList, {
+        'total': total,
+        'question_list': question_list,
+        'next_cursor': next_cursor,
+    })
+
+
+@router.get("/search", response_model=SearchResult)
+async def question_search(q: str = Query(..., min_length=1),
+                          page: int = Query(0, ge=0),
+                          size: int = Query(10, gt=0, le=50),
+                          search_service: SearchService = Depends(get_search_service)):
+    """질문 검색 문서에서 관련도 순으로 검색하고, 일치 부분 주변의 snippet 을 함께 돌려준다."""
+    total, hits = await search_service.search(q, skip=page * size, limit=size)
+    return json_response(SearchResult, {
+        'total': total,
+        'results': hits,
+    })
+
+
+@router.get("/detail/{question_id}", response_model=QuestionOut | QuestionDetailOut)
+async def get_question(question_id: int,
+                      request: Request,
+                      answers: Literal["all", "page"] = "all",
+                      answer_size: int = Query(20, gt=0, le=100),
+                      answer_sort: AnswerSort = "oldest",
+                      question_service: QuestionService = Depends(get_question_service),
+                      answer_service: AnswerService = Depends(get_answer_service)):
+    """ETag(강한 검증자)를 내려주고, If-None-Match 가 일치하면 QuestionOut 을 만들지 않고 304 로 응답한다.
+    - answers=all(기본): 답변 전체를 answers_all 에 담는다. (이전 응답 형식)
+    - answers=page: 답변은 answer_sort 순 첫 answer_size 개만 담고 answers_next_cursor 를 준다.
+      스레드 크기와 무관하게 상세 조회 비용이 일정하다. 나머지는 GET /{question_id}/answers 로 읽는다.
+    """
+    etag = await question_service.get_question_etag(question_id)
+    if etag is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="해당 게시글을 찾을 수 없습니다."
+        )
+    if answers == "page":
+        # 같은 질문이라도 모드/페이지 크기/정렬마다 응답 본문이 다르므로 ETag 도 구분한다.
+        etag = make_etag(etag, answers, answer_size, answer_sort)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+    question = await question_service.get_question(question_id, with_answers=answers == "all")
+    if question is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="등록된 게시물이 없습니다."
+            detail="해당 게시글을 찾을 수 없습니다."
         )
+    # 캐시는 하되 매번 ETag 로 재검증
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if answers == "all":
+        return json_response(QuestionOut, question, headers=headers)
+
+    answer_list, next_cursor = await answer_service.get_answers_by_cursor(question_id, limit=answer_size,
+                                                                         sort=answer_sort)
+    detail = QuestionDetailOut.model_validate(question) # answers_all 은 로드하지 않았으므로 빈 목록
+    detail.answers_all = get_adapter(list[AnswerOut]).validate_python(answer_list, from_attributes=True)
+    detail.answers_next_cursor = next_cursor
+    return json_response(QuestionDetailOut, detail, headers=headers)
 
-    return {
+
+@router.get("/{question_id}/answers", response_model=AnswerList)
+async def question_answers(question_id: int,
+                           cursor: str | None = None,
+                           size: int = Query(20, gt=0, le=100),
+                           sort: AnswerSort = "oldest",
+                           answer_service: AnswerService = Depends(get_answer_service)):
+    """질문의 답변 목록 (키셋 페이지네이션). 첫 페이지는 cursor 없이, 이후에는 응답의 next_cursor 를 그대로 넘긴다.
+    sort: oldest(기본), newest, votes. total 은 질문의 answer_count"""
+    total = await answer_service.get_answer_count(question_id)
+    if total is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="해당 게시글을 찾을 수 없습니다."
+        )
+    try:
+        answer_list, next_cursor = await answer_service.get_answers_by_cursor(question_id, cursor=cursor, limit=size,
+                                                                             sort=sort)
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="잘못된 커서입니다."
+        )
+    return json_response(AnswerList, {
         'total': total,
-        'question_list': question_list
-    }
+        'answer_list': answer_list,
+        'next_cursor': next_cursor,
+    })
 
 
-@router.get("/detail/{question_id}", response_model=QuestionOut)
-async def get_question(question_id: int,
-                      question_service: QuestionService = Depends(get_question_service)):
-    question = await question_service.get_question(question_id)
-    if question is None:
+@router.get("/{question_id}/events", response_class=StreamingResponse)
+async def question_events(question_id: int,
+                          request: Request,
+                          answer_service: AnswerService = Depends(get_answer_service)):
+    """질문 상세 실시간 이벤트 (Server-Sent Events). 상세 전체를 다시 받지 않고 바뀐 부분만 반영한다.
+    event: answer_created(AnswerOut) | answer_updated(AnswerUpdateOut) | answer_deleted({id})
+         | vote_changed({target: question|answer, id, vote_count}) | question_updated(QuestionUpdateOut)
+         | question_deleted({id}) | resync({}, 놓친 이벤트가 있으니 상세를 다시 읽을 것)
+    """
+    if await answer_service.get_answer_count(question_id) is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="해당 게시글을 찾을 수 없습니다."
         )
-    return question
+    # 연결이 오래 유지되므로 DB 커넥션을 먼저 반환한다. (StreamingResponse 는 전송이 끝난 뒤에야 반환된다)
+    await request.state.db_session.release()
+
+    async def event_stream():
+        async with pubsub.subscribe(question_topic(question_id)) as queue:
+            yield b"retry: 3000\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=config.SSE_KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                event, data = message.split("\n", 1)
+                yield f"event: {event}\ndata: {data}\n\n".encode("utf-8")
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 
 @router.put("/update/{question_id}",
-            response_model=schema_question.QuestionOut,
-            # 각 answer의 question 필드를 제외하여 순환 제거
-            response_model_exclude={'answers_all': {'__all__': {'question'}}},
-            )
+            response_model=schema_question.QuestionUpdateOut)
 async def update_question(question_id: int,
                           question_in: schema_question.QuestionIn,
                           question_service: QuestionService = Depends(get_question_service),
-                          current_user: User = Depends(get_current_user)):
-    """ Swagger Docs 에서
-        RecursionError: maximum recursion depth exceeded 에러 발생하여 아래처럼 수정했다.
-            - 빠르게 우회(스키마 변경 없이): 응답에서 역참조 제외
-            - update 응답에서 answers_all 안의 question 필드를 제외
-
-            response_model=schema_question.QuestionOut,
-            # 각 answer의 question 필드를 제외하여 순환 제거
-            response_model_exclude={'answers_all': {'__all__': {'question'}}},
-    """
-    question = await question_service.update_question(question_id, question_in, current_user)
+                          current_user: CurrentUser = Depends(get_current_user)):
+    """바뀐 필드와 새 version 만 돌려준다. 요청에 version 을 보내면 그 사이 다른 수정이 있을 때 409"""
+    try:
+        question = await question_service.update_question(question_id, question_in, current_user)
+    except VersionConflictError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="다른 곳에서 먼저 수정되었습니다. 새로고침 후 다시 시도해주세요."
+        )
     if question is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -80,13 +236,13 @@ async def update_question(question_id: int,
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Not authorized: 접근 권한이 없습니다."
         )
-    return question
+    return json_response(schema_question.QuestionUpdateOut, question)
 
 
 @router.delete("/delete/{question_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_question(question_id: int,
                          question_service: QuestionService = Depends(get_question_service),
-                         current_user: User = Depends(get_current_user)):
+                         current_user: CurrentUser = Depends(get_current_user)):
     question = await question_service.delete_question(question_id, current_user)
     if question is None:
         raise HTTPException(
@@ -102,13 +258,14 @@ async def delete_question(question_id: int,
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
-@router.post("/vote/{question_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.post("/vote/{question_id}", response_model=VoteOut)
 async def question_vote(question_id: int,
                   question_service: QuestionService = Depends(get_question_service),
-                  current_user: User = Depends(get_current_user)):
-    question = await question_service.get_question(question_id)
-    if not question:
+                  current_user: CurrentUser = Depends(get_current_user)):
+    # 존재 확인/작성자 확인/중복 확인을 서비스의 조건부 INSERT 한 문장으로 처리한다.
+    vote = await question_service.vote_question(question_id, current_user)
+    if vote is None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                             detail="데이터를 찾을수 없습니다.")
-    await question_service.vote_question(question_id, current_user)
-    return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+    # recorded=False: 본인 글이거나 이미 추천함 (요청은 멱등하게 성공)
+    return json_response(VoteOut, vote)
\ No newline at end of file
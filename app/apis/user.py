@@ -1,9 +1,16 @@
-from fastapi import APIRouter, status, Depends, HTTPException
+import logging
 
+from fastapi import APIRouter, status, Depends, HTTPException, Response
+
+from app.core.database import SessionReleasingRoute
+from app.core.hashing import HashingPoolBusyError
+from app.dependencies.auth import get_current_user, principal_cache
 from app.schemas import user as schema_user
+from app.schemas.auth import CurrentUser
 from app.services.user_service import UserService, get_user_service
 
-router = APIRouter()
+router = APIRouter(route_class=SessionReleasingRoute)
+logger = logging.getLogger(__name__)
 
 @router.post("/register",
              response_model=schema_user.UserOut,)
@@ -19,12 +26,52 @@ async def register_user(user_in: schema_user.UserIn,
 
     existed_user_email = await user_service.get_user_by_email(str(user_in.email))
     if existed_user_email:
-        print(f"Registration failed: Email already exists - {user_in.email}")
+        logger.info("Registration failed: email already exists", extra={"email": str(user_in.email)})
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="이미 존재하는 이메일입니다.",
         )
 
-    created_user = await user_service.create_user(user_in)
+    try:
+        created_user = await user_service.create_user(user_in)
+    except HashingPoolBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="요청이 많아 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": "1"},
+        )
+
+    return created_user
+
+
+@router.post("/password", status_code=status.HTTP_204_NO_CONTENT)
+async def change_password(password_in: schema_user.PasswordChangeIn,
+                          current_user: CurrentUser = Depends(get_current_user),
+                          user_service: UserService = Depends(get_user_service)):
+    """비밀번호를 바꾸면 token_version 이 올라가 이 토큰을 포함한 기존 토큰이 모두 무효가 된다. (다시 로그인)"""
+    try:
+        changed = await user_service.change_password(current_user.id, password_in.current_password, password_in.password1)
+    except HashingPoolBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="요청이 많아 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": "1"},
+        )
+    if not changed:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="현재 비밀번호가 일치하지 않습니다.",
+        )
+    # Core UPDATE 는 ORM 이벤트(_invalidate_principal)를 거치지 않으므로 이 워커의 캐시를 직접 비운다.
+    # 다른 워커는 AUTH_CACHE_TTL 이 지나면 token_version 비교로 거절한다.
+    principal_cache.invalidate_tag(current_user.id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
 
-    return created_user
\ No newline at end of file
+@router.post("/logout-all", status_code=status.HTTP_204_NO_CONTENT)
+async def logout_all(current_user: CurrentUser = Depends(get_current_user),
+                     user_service: UserService = Depends(get_user_service)):
+    """모든 기기에서 로그아웃: 지금까지 발급된 토큰을 모두 무효화한다."""
+    await user_service.revoke_tokens(current_user.id)
+    principal_cache.invalidate_tag(current_user.id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,229 @@
+import time
+import zlib
+
+from app.core.metrics import Counter, Histogram
+
+try:
+    import brotli
+except ImportError: # 선택 의존성: 없으면 gzip 만 협상한다.
+    brotli = None
+
+""" 응답 압축 (gzip / brotli)
+질문/답변 본문은 QuillEditor 의 HTML 이라 목록/상세 JSON 이 크고 압축이 잘 된다.
+- Accept-Encoding(q 값 포함)으로 협상한다. brotli 패키지가 있으면 br 을 우선, 없으면 gzip
+- 압축할 형식(COMPRESSIBLE_TYPES)만 압축한다. 이미지/zip 등 이미 압축된 형식과 SSE(text/event-stream, 이벤트마다 바로 보내야 함)는 그대로
+- 본문이 한 번에 오면 minimum_size 미만은 그대로 보낸다. 여러 번에 나눠 오는(StreamingResponse) 본문은 청크마다 이어서 압축해서 흘려보낸다.
+- 압축하면 강한 ETag 를 약한 ETag(W/"...")로 바꾼다. (표현이 달라지므로, If-None-Match 는 약한 비교라 304 는 그대로 동작)
+- 지표: 인코딩별 압축 전/후 바이트(비율), 압축에 쓴 CPU 시간, 건너뛴 이유
+"""
+
+COMPRESSIBLE_TYPES = (
+    "text/html", "text/plain", "text/css", "text/csv", "text/javascript", "text/xml",
+    "application/json", "application/x-ndjson", "application/javascript", "application/xml", "image/svg+xml",
+)
+
+COMPRESSION_RESPONSES = Counter("http_compression_responses_total", "압축한 응답 수", ("encoding",))
+COMPRESSION_SKIPPED = Counter("http_compression_skipped_total", "압축하지 않은 응답 수", ("reason",))
+COMPRESSION_BYTES_IN = Counter("http_compression_bytes_in_total", "압축 전 본문 바이트", ("encoding",))
+COMPRESSION_BYTES_OUT = Counter("http_compression_bytes_out_total", "압축 후 본문 바이트", ("encoding",))
+COMPRESSION_RATIO = Histogram("http_compression_ratio", "응답별 압축 후/압축 전 크기 비율", ("encoding",),
+                              buckets=(0.05, 0.1, 0.15, 0.2, 0.3, 0.4, 0.5, 0.7, 0.9, 1.0))
+COMPRESSION_CPU = Histogram("http_compression_cpu_seconds", "응답별 압축 CPU 시간", ("encoding",),
+                            buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25))
+
+
+def negotiate_encoding(accept_encoding: str, brotli_available: bool = brotli is not None) -> str | None:
+    """Accept-Encoding 에서 쓸 인코딩("br"/"gzip")을 고른다. 없으면 None. q 값이 같으면 br 우선"""
+    weights: dict[str, float] = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip()] = q
+    wildcard = weights.get("*", 0.0)
+    candidates = ["br", "gzip"] if brotli_available else ["gzip"]
+    best, best_q = None, 0.0
+    for name in candidates:
+        q = weights.get(name, wildcard)
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type in COMPRESSIBLE_TYPES or media_type.endswith("+json")
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        # gzip 헤더(wbits=16+) 로 한 번에 스트리밍 압축한다.
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """순수 ASGI 응답 압축 미들웨어 (Starlette GZipMiddleware 와 달리 br 협상, 약한 ETag, 지표를 함께 처리)"""
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _encoder(self, encoding: str):
+        if encoding == "br":
+            return _BrotliEncoder(self.brotli_quality)
+        return _GzipEncoder(self.gzip_level)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        encoding = negotiate_encoding(accept_encoding) if accept_encoding else None
+        if scope["method"] == "HEAD":
+            encoding = None
+
+        start_message = None
+        encoder = None
+        passthrough = False
+        bytes_in = bytes_out = 0
+        cpu = 0.0
+
+        async def send_wrapper(message):
+            nonlocal start_message, encoder, passthrough, bytes_in, bytes_out, cpu
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                # 본문 첫 조각을 보고 압축 여부를 정하므로 시작 메시지는 잠시 들고 있는다.
+                start_message = message
+                headers = {k.lower(): v for k, v in message.get("headers", [])}
+                reason = self._skip_reason(message["status"], headers)
+                if reason is None:
+                    _append_vary(message)
+                    if encoding is None:
+                        reason = "not_accepted"
+                if reason is not None:
+                    COMPRESSION_SKIPPED.inc(reason=reason)
+                    passthrough = True
+                    await send(message)
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if encoder is None:
+                if not more_body and len(body) < self.minimum_size:
+                    COMPRESSION_SKIPPED.inc(reason="too_small")
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                encoder = self._encoder(encoding)
+                _set_encoding_headers(start_message, encoding)
+
+            started = time.thread_time()
+            compressed = encoder.compress(body)
+            if not more_body:
+                compressed += encoder.finish()
+            cpu += time.thread_time() - started
+            bytes_in += len(body)
+            bytes_out += len(compressed)
+
+            if start_message is not None:
+                if not more_body:
+                    # 한 번에 온 본문: 압축 후 길이로 Content-Length 를 다시 쓴다.
+                    _set_content_length(start_message, len(compressed))
+                await send(start_message)
+                start_message = None
+
+            if compressed or not more_body:
+                await send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+            if not more_body:
+                COMPRESSION_RESPONSES.inc(encoding=encoding)
+                COMPRESSION_BYTES_IN.inc(bytes_in, encoding=encoding)
+                COMPRESSION_BYTES_OUT.inc(bytes_out, encoding=encoding)
+                if bytes_in:
+                    COMPRESSION_RATIO.observe(bytes_out / bytes_in, encoding=encoding)
+                COMPRESSION_CPU.observe(cpu, encoding=encoding)
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _skip_reason(self, status: int, headers: dict[bytes, bytes]) -> str | None:
+        if status < 200 or status in (204, 206, 304):
+            return "status"
+        if b"content-encoding" in headers:
+            return "encoded"
+        if b"no-transform" in headers.get(b"cache-control", b"").lower():
+            return "no_transform"
+        content_type = headers.get(b"content-type", b"").decode("latin-1")
+        if not content_type or not is_compressible(content_type):
+            return "content_type"
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) < self.minimum_size:
+            return "too_small"
+        return None
+
+
+def _append_vary(message):
+    """같은 URL 이 Accept-Encoding 에 따라 다른 본문이 되므로 캐시가 구분하도록 Vary 를 붙인다."""
+    headers = list(message.get("headers", []))
+    for i, (name, value) in enumerate(headers):
+        if name.lower() == b"vary":
+            if b"accept-encoding" not in value.lower() and value.strip() != b"*":
+                headers[i] = (name, value + b", Accept-Encoding")
+            break
+    else:
+        headers.append((b"vary", b"Accept-Encoding"))
+    message["headers"] = headers
+
+
+def _set_encoding_headers(message, encoding: str):
+    headers = []
+    for name, value in message.get("headers", []):
+        lowered = name.lower()
+        if lowered == b"content-length":
+            continue # 스트리밍이면 chunked, 한 번에 온 본문이면 압축 후 다시 넣는다.
+        if lowered == b"etag" and not value.startswith(b"W/"):
+            value = b"W/" + value
+        headers.append((name, value))
+    headers.append((b"content-encoding", encoding.encode("latin-1")))
+    message["headers"] = headers
+
+
+def _set_content_length(message, length: int):
+    message["headers"] = list(message["headers"]) + [(b"content-length", str(length).encode("latin-1"))]
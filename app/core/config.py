@@ -1,3 +1,4 @@
+import logging
 import os
 
 from dotenv import load_dotenv
@@ -7,6 +8,8 @@ from app.core.settings import ENV_PATH, APP_ENV, APP_NAME, APP_VERSION, APP_DESC
 
 load_dotenv(ENV_PATH) # 환경설정 .env 파일을 사용하려면 반드시...
 
+logger = logging.getLogger(__name__)
+
 class BaseConfig(BaseSettings):
     APP_ENV: str = APP_ENV
     APP_NAME: str = APP_NAME
@@ -21,9 +24,66 @@ class BaseConfig(BaseSettings):
     DB_PORT: str
     DB_USER: str
     DB_PASSWORD: str
+    # 설정하면 위 DB_* 조합 대신 이 URL 을 그대로 사용한다. (예: 벤치마크용 sqlite+aiosqlite:///./bench.db)
+    DATABASE_URL: str | None = os.environ.get("DATABASE_URL")
+    # 읽기 전용 복제본 URL 목록(쉼표로 구분). 비어 있으면 primary 하나만 사용한다.
+    # 예: mysql+aiomysql://user:pw@replica1:3306/db?charset=utf8,mysql+aiomysql://user:pw@replica2:3306/db?charset=utf8
+    DB_REPLICA_URLS: str | None = os.environ.get("DB_REPLICA_URLS")
+    DB_REPLICA_HEALTH_CHECK_INTERVAL: int = 10 # 초
+    # 쓰기 요청 뒤 이 시간(초) 동안은 같은 클라이언트의 GET 도 primary 에서 읽는다. (쿠키, 0 이면 사용하지 않음)
+    DB_READ_PRIMARY_AFTER_WRITE: float = 5
+    # 질문 삭제: 답변이 이 개수 이상이면 소프트 삭제 후 백그라운드에서 나눠서 지운다. (0 이면 항상 즉시 삭제)
+    QUESTION_SOFT_DELETE_THRESHOLD: int = 500
+    QUESTION_PURGE_INTERVAL: int = 30 # 초, 0 이면 백그라운드 정리를 돌리지 않는다. (manage.py purge-deleted 로 수동 실행)
+    QUESTION_PURGE_BATCH_SIZE: int = 1000 # 한 트랜잭션에서 지우는 답변 수
+
+    # 질문 상세 실시간 이벤트(SSE). 워커가 여러 개면 Redis 로 워커 사이에 전달한다. (비어 있으면 프로세스 내 전달만)
+    PUBSUB_REDIS_URL: str | None = os.environ.get("PUBSUB_REDIS_URL")
+    PUBSUB_QUEUE_SIZE: int = 100 # 구독자별 대기 이벤트 수, 넘치면 resync
+    SSE_KEEPALIVE_INTERVAL: int = 15 # 초, 프록시가 유휴 연결을 끊지 않도록 주석 줄을 보낸다.
+
+    # commit 뒤 후처리 잡 큐 (app/core/jobs.py)
+    JOB_WORKERS: int = 2
+    JOB_QUEUE_SIZE: int = 1000 # 넘으면 거절 (검색 문서 드리프트는 manage.py reindex-search 로 복구)
+    JOB_MAX_RETRIES: int = 3
+    JOB_RETRY_BACKOFF: float = 0.5 # 초, 재시도마다 2배
+    JOB_DRAIN_TIMEOUT: float = 10 # 초, 종료 시 남은 잡을 처리하며 기다리는 최대 시간
+
+    # 응답 압축 (app/core/compression.py). brotli 패키지가 있으면 br, 없으면 gzip
+    COMPRESSION_ENABLED: bool = True # 앞단 프록시(nginx 등)에서 압축한다면 False
+    COMPRESSION_MINIMUM_SIZE: int = 1024 # 바이트, 이보다 작은 응답은 압축하지 않는다.
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4 # 0~11, 높을수록 작아지지만 CPU 를 많이 쓴다. (동적 응답은 4~5 정도)
+
+    # 커넥션 풀 (primary/복제본 엔진 공통). 환경별 값은 아래 Development/ProductionConfig 에서 덮어쓴다.
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 0
+    DB_POOL_TIMEOUT: float = 30 # 풀이 가득 찼을 때 checkout 을 기다리는 최대 시간(초)
+    DB_POOL_RECYCLE: int = 300 # 5분마다 연결 재활용 (MySQL wait_timeout 보다 짧게)
+    DB_POOL_PRE_PING: bool = True # checkout 시 끊어진 연결을 감지해서 교체
+    DB_POOL_WARMUP: int = 0 # 기동 시 미리 열어둘 커넥션 수 (pool_size 이하)
+
+    # 관리자 API(/apis/admin) 접근을 허용할 사용자 닉네임 목록(쉼표로 구분)
+    ADMIN_USERNAMES: str | None = os.environ.get("ADMIN_USERNAMES")
+
+    # 로깅 (app/core/logger.py)
+    LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = True # False 면 사람이 읽기 쉬운 한 줄 포맷
+    LOG_DEBUG_SAMPLE_RATE: float = 1.0 # DEBUG 레코드를 남길 비율 (0~1)
 
     SECRET_KEY: str = os.environ.get("SECRET_KEY")
 
+    # 인증 principal 캐시 (app/dependencies/auth.py): 토큰 -> (id, username, token_version) 스냅샷
+    # 워커마다 따로 존재하므로 TTL 을 짧게 유지한다. 0 이면 캐시하지 않음.
+    AUTH_CACHE_TTL: int = 30
+    AUTH_CACHE_MAXSIZE: int = 10000
+
+    # 비밀번호 해싱 전용 프로세스 풀 (app/core/hashing.py)
+    # HASH_POOL_SIZE 는 워커 프로세스 수(0 이면 풀 없이 스레드로 실행), HASH_POOL_QUEUE_SIZE 는 워커가 모두 바쁠 때
+    # 기다릴 수 있는 작업 수. 이를 넘는 로그인/가입 요청은 기다리지 않고 503 으로 응답한다.
+    HASH_POOL_SIZE: int = min(os.cpu_count() or 1, 4)
+    HASH_POOL_QUEUE_SIZE: int = 32
+
     model_config = SettingsConfigDict(
         env_file="../../.env",
         env_file_encoding="utf-8"
@@ -41,6 +101,13 @@ class DevelopmentConfig(BaseConfig):
     DB_USER: str = os.environ.get("DEV_DB_USER")
     DB_PASSWORD: str = os.environ.get("DEV_DB_PASSWORD")
 
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 5
+    DB_POOL_WARMUP: int = 1
+
+    LOG_LEVEL: str = "DEBUG"
+    LOG_JSON: bool = False
+
 
 class ProductionConfig(BaseConfig):
     # APP_DESCRIPTION: str = '<a href="https://naver.com"><button>임시 버튼</button></a>'
@@ -52,10 +119,18 @@ class ProductionConfig(BaseConfig):
     DB_USER: str = os.environ.get("PROD_DB_USER")
     DB_PASSWORD: str = os.environ.get("PROD_DB_PASSWORD")
 
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 10
+    DB_POOL_WARMUP: int = 10
+
+    LOG_LEVEL: str = "INFO"
+    LOG_DEBUG_SAMPLE_RATE: float = 0.01 # DEBUG 로 올려도 요청마다 찍히는 로그는 1%만
+
 
 def get_config():
     env = APP_ENV.lower()
-    print("APP_ENV: ", env)
+    logger.debug("APP_ENV: %s", env)
     """ 환경설정 .env 파일을 사용하여 os.environ.get)을 호출하려면,
      반드시 load_dotenv로 경로 설정이 되어 있어야 햔다. """
     if env == "production":
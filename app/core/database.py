@@ -1,23 +1,173 @@
+import asyncio
+import itertools
+import logging
+import time
 from typing import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from sqlalchemy.orm import declarative_base
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.routing import APIRoute
+from sqlalchemy import Select, text, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncAttrs
+from sqlalchemy.orm import declarative_base, Session
 
 from app.core.config import get_config
+from app.core.metrics import TimedQueuePool, DB_SESSION_BINDS, DB_REPLICA_HEALTHY
 
 config = get_config()
-DATABASE_URL = f"{config.DB_TYPE}+{config.DB_DRIVER}://{config.DB_USER}:{config.DB_PASSWORD}@{config.DB_HOST}:{config.DB_PORT}/{config.DB_NAME}?charset=utf8"
+logger = logging.getLogger(__name__)
+DATABASE_URL = config.DATABASE_URL or f"{config.DB_TYPE}+{config.DB_DRIVER}://{config.DB_USER}:{config.DB_PASSWORD}@{config.DB_HOST}:{config.DB_PORT}/{config.DB_NAME}?charset=utf8"
+# 풀 설정은 환경별 config(DB_POOL_*)에서 읽는다. 복제본 엔진도 같은 설정을 사용한다.
+POOL_OPTIONS = dict(
+    pool_size=config.DB_POOL_SIZE,
+    max_overflow=config.DB_MAX_OVERFLOW,
+    pool_timeout=config.DB_POOL_TIMEOUT,
+    pool_recycle=config.DB_POOL_RECYCLE,
+    pool_pre_ping=config.DB_POOL_PRE_PING,
+    poolclass=TimedQueuePool, # checkout 대기 시간 계측 (app/core/metrics.py)
+)
 ASYNC_ENGINE = create_async_engine(DATABASE_URL,
                                    echo=config.DEBUG,
                                    future=True,
-                                   pool_size=10, max_overflow=0, pool_recycle=300, # 5분마다 연결 재활용
+                                   **POOL_OPTIONS,
                                    # encoding="utf-8"
                                    )
 
+
+@event.listens_for(ASYNC_ENGINE.sync_engine, "connect")
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    # 질문/답변 삭제는 FK 의 ON DELETE CASCADE 에 맡긴다. SQLite(로컬/벤치마크)는 연결마다 켜 줘야 동작한다.
+    if ASYNC_ENGINE.dialect.name == "sqlite":
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+class ReplicaSet:
+    """읽기 전용 복제본 엔진 목록. 건강한 복제본을 라운드로빈으로 고르고, 하나도 없으면 None (-> primary)"""
+
+    def __init__(self, urls: list[str]):
+        self.engines = [
+            create_async_engine(url, echo=config.DEBUG, future=True, **POOL_OPTIONS)
+            for url in urls
+        ]
+        self.healthy = [True] * len(self.engines)
+        self._counter = itertools.count()
+        for index in range(len(self.engines)):
+            DB_REPLICA_HEALTHY.set_function(lambda i=index: int(self.healthy[i]), replica=str(index))
+
+    def pick(self) -> int | None:
+        """건강한 복제본의 인덱스를 라운드로빈으로 고른다. 없으면 None"""
+        candidates = [index for index, ok in enumerate(self.healthy) if ok]
+        if not candidates:
+            return None
+        return candidates[next(self._counter) % len(candidates)]
+
+    async def check_health(self, timeout: float = 2.0):
+        for index, engine in enumerate(self.engines):
+            try:
+                async with asyncio.timeout(timeout):
+                    async with engine.connect() as conn:
+                        await conn.execute(text("SELECT 1"))
+                healthy = True
+            except Exception as e:
+                healthy = False
+                if self.healthy[index]:
+                    logger.warning("replica %d unhealthy: %s", index, e)
+            if healthy and not self.healthy[index]:
+                logger.info("replica %d recovered", index)
+            self.healthy[index] = healthy
+
+    async def run_health_checks(self, interval: float):
+        """lifespan 에서 백그라운드 태스크로 실행한다."""
+        while True:
+            await self.check_health()
+            await asyncio.sleep(interval)
+
+    async def dispose(self):
+        for engine in self.engines:
+            await engine.dispose()
+
+
+REPLICAS = ReplicaSet([url.strip() for url in (config.DB_REPLICA_URLS or "").split(",") if url.strip()])
+
+async def warm_up_pool(engine, count: int) -> int:
+    """커넥션 count 개(pool_size 이하)를 동시에 열었다가 풀에 돌려놓는다.
+    배포 직후 첫 요청들이 connect 비용을 내지 않도록 lifespan 에서 호출한다. 실패해도 기동은 계속한다. (열린 커넥션 수 반환)"""
+    count = min(count, engine.sync_engine.pool.size())
+    if count <= 0:
+        return 0
+
+    opened = 0
+    all_opened = asyncio.Event()
+    release = asyncio.Event()
+
+    async def open_one():
+        nonlocal opened
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            opened += 1
+            if opened == count:
+                all_opened.set()
+            await release.wait() # 모두 열릴 때까지 잡고 있어야 같은 커넥션이 재사용되지 않는다.
+
+    tasks = [asyncio.create_task(open_one()) for _ in range(count)]
+    waiter = asyncio.create_task(all_opened.wait())
+    # 모두 열리거나, 하나라도 실패하면 나머지를 풀어준다.
+    await asyncio.wait([waiter, *tasks], return_when=asyncio.FIRST_COMPLETED)
+    release.set()
+    waiter.cancel()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    failures = [r for r in results if isinstance(r, Exception)]
+    if failures:
+        logger.warning("pool warm-up failed for %d connections: %s", len(failures), failures[0])
+    return opened
+
+
+USE_PRIMARY = "use_primary" # session.info 키: True 면 이후 모든 쿼리를 primary 로 보낸다.
+REPLICA_INDEX = "replica_index" # session.info 키: 이 세션이 처음 읽을 때 고른 복제본
+READ_PRIMARY_COOKIE = "read_primary_until" # 쓰기 요청 응답에 붙이는 쿠키: 이 시각(epoch 초)까지 GET 도 primary
+
+
+class RoutingSession(Session):
+    """SELECT 는 복제본, 그 외(flush/INSERT/UPDATE/DELETE)는 primary 로 보내는 세션.
+    - 한 번이라도 쓰기를 하면 세션이 primary 에 고정된다. (같은 요청 안에서 commit 직후 읽기도 primary -> read-your-own-writes)
+    - GET 이 아닌 요청은 get_db 에서 처음부터 primary 로 고정한다. (쓰기 전 조회가 복제 지연으로 틀어지지 않도록)
+    - 복제본은 세션(요청)마다 처음 읽을 때 한 번 고르고 이후 모든 SELECT 에 재사용한다.
+      (ETag 와 본문 등 한 요청의 쿼리들이 지연이 다른 복제본에서 섞여 나오지 않도록)
+    - 쓰기 요청 직후의 GET 은 READ_PRIMARY_COOKIE 를 보고 get_db 에서 primary 로 고정한다. (요청을 넘는 read-your-own-writes)
+    - 복제본이 설정되지 않았으면 기존과 동일하게 ASYNC_ENGINE 만 사용한다.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if not REPLICAS.engines:
+            return super().get_bind(mapper=mapper, clause=clause, **kw)
+        if self.info.get(USE_PRIMARY) or self._flushing or (clause is not None and not isinstance(clause, Select)):
+            self.info[USE_PRIMARY] = True
+            DB_SESSION_BINDS.inc(target="primary")
+            return ASYNC_ENGINE.sync_engine
+        index = self.info.get(REPLICA_INDEX)
+        if index is None or not REPLICAS.healthy[index]:
+            # 고정된 복제본이 헬스체크에서 빠졌을 때만 다시 고른다.
+            index = self.info[REPLICA_INDEX] = REPLICAS.pick()
+        if index is None:
+            DB_SESSION_BINDS.inc(target="primary")
+            return ASYNC_ENGINE.sync_engine
+        DB_SESSION_BINDS.inc(target="replica")
+        return REPLICAS.engines[index].sync_engine
+
+
+def use_primary(session: AsyncSession) -> AsyncSession:
+    """이 세션의 이후 쿼리를 모두 primary 로 보낸다. (관리 커맨드, 쓰기 직전 조회 등)"""
+    session.info[USE_PRIMARY] = True
+    return session
+
+
 # 세션 로컬 클래스 생성
 AsyncSessionLocal = async_sessionmaker(
     ASYNC_ENGINE,
     class_=AsyncSession, # add
+    sync_session_class=RoutingSession, # 읽기/쓰기 분리 (복제본이 없으면 ASYNC_ENGINE 만 사용)
     expire_on_commit=False,
     autocommit=False,
     autoflush=False,
@@ -33,17 +183,90 @@ AsyncSessionLocal = async_sessionmaker(
  autocommit=True인 경우에는 commit이 필요없는 것처럼 rollback도 동작하지 않는다는 점에 주의해야 한다.
 """
 
-Base = declarative_base() # Base 클래스 (모든 모델이 상속)
+Base = declarative_base(cls=AsyncAttrs) # Base 클래스 (모든 모델이 상속), AsyncAttrs: await obj.awaitable_attrs.<관계> 로 지연 로딩
+
+class LazySession:
+    """AsyncSession 지연 생성 프록시
+    - 서비스가 처음 사용할 때(self.db.execute 등) 세션을 만든다. 검증 실패로 핸들러가 실행되지 않거나
+      DB 를 쓰지 않는 요청은 세션도, 커넥션도 만들지 않는다.
+    - 커넥션은 첫 쿼리에서 checkout 되고 commit/rollback 시 풀로 반환된다. (SQLAlchemy 기본 동작)
+    - 읽기만 하고 commit 하지 않는 요청은 release() 로 응답 전송 전에 반환한다. (SessionReleasingRoute)
+    """
+    __slots__ = ("_factory", "_session")
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._session: AsyncSession | None = None
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self._factory()
+        return self._session
+
+    @property
+    def started(self) -> bool:
+        return self._session is not None
+
+    def __getattr__(self, name):
+        return getattr(self.session, name)
+
+    async def release(self):
+        """열린 트랜잭션을 끝내고 커넥션을 풀에 돌려준다. 이후 다시 사용하면 새 커넥션을 checkout 한다."""
+        if self._session is not None:
+            await self._session.close()
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    session: AsyncSession = AsyncSessionLocal()
-    print(f"[get_session] new session: {id(session)}")
+
+def read_primary_requested(request: Request) -> bool:
+    """최근(DB_READ_PRIMARY_AFTER_WRITE 초 이내)에 쓰기를 한 클라이언트인지. 쿠키 값은 만료 시각이며 범위를 벗어나면 무시한다."""
+    value = request.cookies.get(READ_PRIMARY_COOKIE)
+    if not value:
+        return False
+    try:
+        until = float(value)
+    except ValueError:
+        return False
+    now = time.time()
+    return now < until <= now + config.DB_READ_PRIMARY_AFTER_WRITE
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    session = LazySession(AsyncSessionLocal)
+    request.state.db_session = session
+    if request.method not in ("GET", "HEAD") or (REPLICAS.engines and read_primary_requested(request)):
+        use_primary(session)
     try:
         yield session
     except Exception as e:
-        print(f"Session rollback triggered due to exception: {e}")
-        await session.rollback()
+        if session.started:
+            logger.debug("Session rollback triggered due to exception: %s", e)
+            await session.rollback()
         raise
     finally:
-        print(f"[get_session] close session: {id(session)}")
-        await session.close()
\ No newline at end of file
+        await session.release()
+
+
+class SessionReleasingRoute(APIRoute):
+    """핸들러가 응답 객체를 만든 직후(직렬화까지 끝난 뒤) 요청의 DB 세션을 반환하는 라우트.
+    FastAPI 는 yield 의존성의 종료 코드를 응답 전송이 끝난 뒤에 실행하므로, 그대로 두면
+    느린 클라이언트에게 응답을 보내는 동안에도 커넥션을 잡고 있게 된다.
+    StreamingResponse 는 전송 중에 세션을 쓸 수 있으므로 기존처럼 get_db 종료 시점에 반환한다.
+    복제본을 쓰는 경우, 성공한 쓰기 요청의 응답에 READ_PRIMARY_COOKIE 를 붙여 직후의 GET 이 primary 를 읽게 한다.
+    """
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def release_before_send(request: Request) -> Response:
+            response = await handler(request)
+            session = getattr(request.state, "db_session", None)
+            if session is not None and session.started and request.method not in ("GET", "HEAD") \
+                    and response.status_code < 400 and REPLICAS.engines and config.DB_READ_PRIMARY_AFTER_WRITE > 0:
+                pin = config.DB_READ_PRIMARY_AFTER_WRITE
+                response.set_cookie(READ_PRIMARY_COOKIE, str(round(time.time() + pin, 3)),
+                                    max_age=max(int(pin), 1), httponly=True, samesite="lax")
+            if session is not None and not isinstance(response, StreamingResponse):
+                await session.release()
+            return response
+
+        return release_before_send
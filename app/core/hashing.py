@@ -0,0 +1,72 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from app.core.metrics import Gauge, Histogram, Counter
+
+""" 비밀번호 해싱 전용 프로세스 풀
+bcrypt 는 CPU 바운드라서 asyncio.to_thread(기본 executor)로 보내면
+로그인 폭주 시 다른 요청들이 쓰는 스레드까지 잡아먹고, GIL 때문에 코어를 다 쓰지도 못한다.
+- 별도 ProcessPoolExecutor 에서 실행해서 코어 수만큼 병렬로 처리
+- 풀 크기 + 대기열 크기를 넘으면 기다리지 않고 바로 HashingPoolBusyError (라우트에서 503 으로 변환)
+- lifespan(app/core/inits.py)에서 start/stop 한다. 시작되지 않았으면(manage.py 등) 기존처럼 스레드로 실행
+"""
+
+HASH_QUEUE_DEPTH = Gauge("hash_pool_queue_depth", "해싱 풀에서 실행을 기다리는 작업 수")
+HASH_IN_FLIGHT = Gauge("hash_pool_in_flight", "해싱 풀에 들어가 있는(대기+실행) 작업 수")
+HASH_LATENCY = Histogram("hash_duration_seconds", "비밀번호 해시/검증 시간(대기 포함)", ("op",),
+                         buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0))
+HASH_REJECTED = Counter("hash_pool_rejected_total", "대기열이 가득 차서 거절된 해싱 작업 수", ("op",))
+
+
+class HashingPoolBusyError(Exception):
+    pass
+
+
+class HashingPool:
+    def __init__(self):
+        self._executor: ProcessPoolExecutor | None = None
+        self.size = 0
+        self.max_pending = 0
+        self.pending = 0
+
+    @property
+    def started(self) -> bool:
+        return self._executor is not None
+
+    def start(self, size: int, queue_size: int):
+        if self._executor is not None:
+            return
+        self.size = size
+        self.max_pending = size + queue_size
+        # fork 는 이벤트 루프/DB 커넥션 상태까지 복제하므로 spawn 으로 깨끗한 워커 프로세스를 띄운다.
+        self._executor = ProcessPoolExecutor(max_workers=size, mp_context=multiprocessing.get_context("spawn"))
+        HASH_QUEUE_DEPTH.set_function(lambda: max(self.pending - self.size, 0))
+        HASH_IN_FLIGHT.set_function(lambda: self.pending)
+
+    def stop(self):
+        if self._executor is None:
+            return
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._executor = None
+
+    async def run(self, op: str, func, *args):
+        start = time.perf_counter()
+        if self._executor is None:
+            result = await asyncio.to_thread(func, *args)
+            HASH_LATENCY.observe(time.perf_counter() - start, op=op)
+            return result
+
+        if self.pending >= self.max_pending:
+            HASH_REJECTED.inc(op=op)
+            raise HashingPoolBusyError()
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self.pending -= 1
+            HASH_LATENCY.observe(time.perf_counter() - start, op=op)
+
+
+hashing_pool = HashingPool()
@@ -1,36 +1,89 @@
-from contextlib import asynccontextmanager
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.apis import question, answer, user, auth
+from app.apis import question, answer, user, auth, admin
+from app.core.compression import CompressionMiddleware
 from app.core.config import get_config, DevelopmentConfig
-from app.core.database import ASYNC_ENGINE
+from app.core.database import ASYNC_ENGINE, REPLICAS, AsyncSessionLocal, use_primary, warm_up_pool
+from app.core.hashing import hashing_pool
+from app.core.jobs import jobs
+from app.core.logger import RequestIdMiddleware, setup_logging
+from app.core.metrics import MetricsMiddleware, install_engine_metrics
+from app.core.pubsub import pubsub, RedisBackend
 from app.core.settings import ORIGINS
-from app.views import root, swagger
+from app.services.question_service import QuestionService
+from app.views import root, swagger, metrics
 
 config = get_config()
+logger = logging.getLogger(__name__)
+
+
+async def purge_deleted_questions_periodically(interval: float, batch_size: int):
+    """소프트 삭제된 질문(답변이 많은 스레드)을 주기적으로 나눠서 지운다."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with AsyncSessionLocal() as session:
+                use_primary(session)
+                purged = await QuestionService(session).purge_deleted_questions(batch_size)
+            if purged:
+                logger.info("Purged %d soft-deleted questions", purged)
+        except Exception:
+            logger.exception("Purging soft-deleted questions failed")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    print("Initializing database......")
+    logger.info("Initializing database......")
     # FastAPI 인스턴스 기동시 필요한 작업 수행.
     '''Redis connection start 여기서 한다.'''
-    print("Starting up...")
+    if config.HASH_POOL_SIZE > 0:
+        hashing_pool.start(config.HASH_POOL_SIZE, config.HASH_POOL_QUEUE_SIZE)
+    await pubsub.start(RedisBackend(config.PUBSUB_REDIS_URL) if config.PUBSUB_REDIS_URL else None,
+                       queue_size=config.PUBSUB_QUEUE_SIZE)
+    jobs.start(config.JOB_WORKERS, config.JOB_QUEUE_SIZE, config.JOB_MAX_RETRIES, config.JOB_RETRY_BACKOFF)
+    if config.DB_POOL_WARMUP > 0:
+        opened = await warm_up_pool(ASYNC_ENGINE, config.DB_POOL_WARMUP)
+        logger.info("Warmed up %d database connections", opened)
+    replica_health_task = None
+    if REPLICAS.engines:
+        replica_health_task = asyncio.create_task(
+            REPLICAS.run_health_checks(config.DB_REPLICA_HEALTH_CHECK_INTERVAL))
+    purge_task = None
+    if config.QUESTION_PURGE_INTERVAL > 0:
+        purge_task = asyncio.create_task(
+            purge_deleted_questions_periodically(config.QUESTION_PURGE_INTERVAL, config.QUESTION_PURGE_BATCH_SIZE))
+    logger.info("Starting up...")
     yield
-    print("Shutting down...")
+    logger.info("Shutting down...")
+    # 요청 처리가 끝난 뒤 남은 후처리 잡을 먼저 비운다. (잡이 DB/해싱 풀을 쓰므로 그것들보다 먼저)
+    await jobs.stop(config.JOB_DRAIN_TIMEOUT)
+    for task in (replica_health_task, purge_task):
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+    hashing_pool.stop()
+    await pubsub.stop()
+    await REPLICAS.dispose()
     await ASYNC_ENGINE.dispose()
 
 
 def including_router(app):
     app.include_router(swagger.router, prefix="/swagger")
     app.include_router(root.router, prefix="", tags=["Root"]) # root 페이지는 / 슬래시를 없애라.
+    app.include_router(metrics.router, prefix="", tags=["Metrics"])
     app.include_router(question.router, prefix="/apis/questions", tags=["Question"])
     app.include_router(answer.router, prefix="/apis/answers", tags=["Answer"])
 
     app.include_router(user.router, prefix="/apis/accounts", tags=["User"])
     app.include_router(auth.router, prefix="/apis/auth", tags=["Auth"])
+    app.include_router(admin.router, prefix="/apis/admin", tags=["Admin"])
 
 
 def including_middleware(app):
@@ -40,10 +93,21 @@ def including_middleware(app):
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["ETag", "X-Request-ID"], # ETag: 상세 조회 조건부 요청(If-None-Match)용
     )
+    if config.COMPRESSION_ENABLED:
+        app.add_middleware(CompressionMiddleware, minimum_size=config.COMPRESSION_MINIMUM_SIZE,
+                           gzip_level=config.COMPRESSION_GZIP_LEVEL, brotli_quality=config.COMPRESSION_BROTLI_QUALITY)
+    app.add_middleware(RequestIdMiddleware)
+    # 가장 바깥에서 전체 처리 시간을 재도록 마지막에 추가한다. (add_middleware 는 나중에 추가한 것이 바깥)
+    app.add_middleware(MetricsMiddleware)
+    install_engine_metrics(ASYNC_ENGINE)
+    for replica in REPLICAS.engines:
+        install_engine_metrics(replica, pool_gauges=False)
 
 
 def initialize_app():
+    setup_logging(config.LOG_LEVEL, config.LOG_DEBUG_SAMPLE_RATE, config.LOG_JSON)
     app = FastAPI(title=config.APP_NAME,
                   version=config.APP_VERSION,
                   description=config.APP_DESCRIPTION,
@@ -59,10 +123,8 @@ def initialize_app():
     including_router(app)
     including_middleware(app)
 
-    if config == DevelopmentConfig():
-        print("DEV create_app dev: ", config.APP_NAME)
-        print("DEV config.DEBUG: ", config.DEBUG)
+    if isinstance(config, DevelopmentConfig):
+        logger.info("DEV create_app dev: %s (DEBUG=%s)", config.APP_NAME, config.DEBUG)
     else:
-        print("PROD create_app prod: ", config.APP_NAME)
-        print("PROD config.DEBUG: ", config.DEBUG)
+        logger.info("PROD create_app prod: %s (DEBUG=%s)", config.APP_NAME, config.DEBUG)
     return app
\ No newline at end of file
@@ -0,0 +1,151 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from app.core.metrics import Gauge, Counter, Histogram
+
+""" 프로세스 내 후처리 잡 큐
+요청 안에서는 꼭 필요한 쓰기만 하고, commit 뒤에 해도 되는 일(검색 문서 재생성, 재집계, 캐시 무효화, 알림 등)은
+jobs.enqueue(...) 로 넘겨서 응답 지연에서 뺀다.
+- lifespan(app/core/inits.py)에서 워커 태스크를 띄우고, 종료 시 남은 잡을 drain_timeout 동안 처리한 뒤 멈춘다.
+- 용량(JOB_QUEUE_SIZE)을 넘으면 기다리지 않고 거절한다. (enqueue 가 False, 호출한 쪽의 쓰기는 이미 commit 됨)
+- 실패하면 max_retries 번까지 지수 백오프로 다시 실행한다.
+- key 를 주면 같은 key 의 잡이 아직 대기 중일 때 중복으로 넣지 않는다. (같은 질문 재색인 여러 번 -> 한 번)
+  같은 key 의 잡은 동시에 실행되지 않는다. 실행 중에 들어온 요청은 끝난 뒤 한 번 더 실행한다. (실행 중 바뀐 내용 반영)
+- 잡 함수는 요청의 세션을 쓰지 말고 자기 세션을 연다. (요청 세션은 응답과 함께 닫힌다)
+"""
+
+logger = logging.getLogger(__name__)
+
+JOBS_QUEUED = Gauge("jobs_queued", "실행을 기다리는 후처리 잡 수")
+JOBS_RUNNING = Gauge("jobs_running", "실행 중인 후처리 잡 수")
+JOBS_PROCESSED = Counter("jobs_processed_total", "끝난 후처리 잡 수", ("job", "status"))
+JOBS_RETRIED = Counter("jobs_retried_total", "다시 실행한 후처리 잡 수", ("job",))
+JOBS_REJECTED = Counter("jobs_rejected_total", "큐가 가득 차서 거절된 후처리 잡 수", ("job",))
+JOB_DURATION = Histogram("job_duration_seconds", "후처리 잡 실행 시간(재시도 포함)", ("job",),
+                         buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0))
+
+
+@dataclass
+class Job:
+    name: str
+    func: Callable[..., Awaitable[Any]]
+    args: tuple = ()
+    key: str | None = None
+    max_retries: int = 3
+
+
+class JobQueue:
+    def __init__(self, maxsize: int = 1000):
+        self._queue: asyncio.Queue[Job] = asyncio.Queue(maxsize=maxsize)
+        self._workers: list[asyncio.Task] = []
+        self._pending_keys: set[str] = set() # 큐에서 대기 중인 key
+        self._running_keys: dict[str, bool] = {} # 실행 중인 key -> 끝난 뒤 다시 실행할지
+        self._accepting = True
+        self.max_retries = 3
+        self.retry_backoff = 0.5
+        self.running = 0
+        JOBS_QUEUED.set_function(lambda: self._queue.qsize())
+        JOBS_RUNNING.set_function(lambda: self.running)
+
+    @property
+    def started(self) -> bool:
+        return bool(self._workers)
+
+    def start(self, workers: int, maxsize: int | None = None, max_retries: int = 3, retry_backoff: float = 0.5):
+        if self._workers:
+            return
+        if maxsize is not None and self._queue.empty():
+            self._queue = asyncio.Queue(maxsize=maxsize)
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._accepting = True
+        self._workers = [asyncio.create_task(self._worker(), name=f"job-worker-{i}") for i in range(workers)]
+
+    async def stop(self, drain_timeout: float = 10.0):
+        """새 잡을 받지 않고, 남은 잡을 drain_timeout 초까지 처리한 뒤 워커를 멈춘다."""
+        if not self._workers:
+            return
+        self._accepting = False
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Job queue drain timed out, %d jobs dropped", self._queue.qsize())
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def enqueue(self, name: str, func: Callable[..., Awaitable[Any]], *args, key: str | None = None,
+                max_retries: int | None = None) -> bool:
+        """commit 이 끝난 뒤에 호출한다. 넣었거나 같은 key 가 이미 대기 중이면 True, 거절되면 False"""
+        if key is not None and key in self._pending_keys:
+            return True
+        if key is not None and key in self._running_keys and self._accepting:
+            self._running_keys[key] = True
+            return True
+        if not self._accepting:
+            JOBS_REJECTED.inc(job=name)
+            logger.warning("Job rejected during shutdown: %s", name)
+            return False
+        job = Job(name, func, args, key, self.max_retries if max_retries is None else max_retries)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            JOBS_REJECTED.inc(job=name)
+            logger.warning("Job queue full, rejected: %s", name)
+            return False
+        if key is not None:
+            self._pending_keys.add(key)
+        return True
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            # 실행 중에는 같은 key 를 큐에 다시 넣지 않고 표시만 해 둔다. (다른 워커가 동시에 실행하지 않도록)
+            if job.key is not None:
+                self._pending_keys.discard(job.key)
+                self._running_keys[job.key] = False
+            self.running += 1
+            start = time.perf_counter()
+            try:
+                await self._run(job)
+            finally:
+                self.running -= 1
+                JOB_DURATION.observe(time.perf_counter() - start, job=job.name)
+                if job.key is not None and self._running_keys.pop(job.key, False):
+                    self._requeue(job)
+                self._queue.task_done()
+
+    def _requeue(self, job: Job):
+        # 실행 중에 같은 key 로 다시 요청됨: 최신 내용으로 한 번 더 실행한다.
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            JOBS_REJECTED.inc(job=job.name)
+            logger.warning("Job queue full, rejected: %s", job.name)
+            return
+        self._pending_keys.add(job.key)
+
+    async def _run(self, job: Job):
+        for attempt in range(job.max_retries + 1):
+            try:
+                await job.func(*job.args)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                if attempt == job.max_retries:
+                    JOBS_PROCESSED.inc(job=job.name, status="failed")
+                    logger.exception("Job failed: %s", job.name, extra={"attempts": attempt + 1})
+                    return
+                JOBS_RETRIED.inc(job=job.name)
+                logger.warning("Job failed, retrying: %s", job.name, exc_info=True, extra={"attempts": attempt + 1})
+                await asyncio.sleep(self.retry_backoff * 2 ** attempt)
+            else:
+                JOBS_PROCESSED.inc(job=job.name, status="ok")
+                return
+
+
+jobs = JobQueue()
@@ -0,0 +1,143 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+""" 로깅
+print() 는 이벤트 루프 위에서 stdout 에 동기적으로 쓰므로 부하가 걸리면 지연시간에 그대로 드러난다.
+- 요청 처리 쪽은 QueueHandler 로 레코드를 큐에 넣기만 하고, 실제 포맷/출력은 QueueListener 스레드가 한다.
+- 레코드에는 request_id 가 붙는다. (RequestIdMiddleware 가 X-Request-ID 헤더를 읽거나 새로 만든다)
+- DEBUG 레코드는 LOG_DEBUG_SAMPLE_RATE 비율만 남긴다. (큐에 넣기 전에 버린다)
+- 사용: logger = logging.getLogger(__name__) 후 logger.info("...", extra={"user_id": 1})
+"""
+
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+# LogRecord 기본 속성. 이 외의 속성(extra=...)은 JSON 필드로 내보낸다.
+_RESERVED_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+_listener: QueueListener | None = None
+
+
+class RequestIdFilter(logging.Filter):
+    """로그를 남긴 시점(요청 컨텍스트 안)의 request_id 를 레코드에 기록한다. 리스너 스레드에서는 컨텍스트를 알 수 없다."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class DebugSamplingFilter(logging.Filter):
+    """DEBUG 레코드를 rate 비율만 통과시킨다. (INFO 이상은 항상 통과)"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.rate >= 1.0:
+            return True
+        return random.random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """개발용 한 줄 포맷: 시간 레벨 logger [request_id] 메시지 key=value ..."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        extra = " ".join(f"{k}={v}" for k, v in record.__dict__.items() if k not in _RESERVED_ATTRS)
+        line = (f"{datetime.fromtimestamp(record.created).strftime('%H:%M:%S.%f')[:-3]} {record.levelname:<7} "
+                f"{record.name} [{getattr(record, 'request_id', None) or '-'}] {record.getMessage()}")
+        if extra:
+            line += " " + extra
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+def setup_logging(level: str = "INFO", debug_sample_rate: float = 1.0, json_format: bool = True):
+    """app.* 로거에 큐 핸들러를 연결하고 출력 스레드를 시작한다. (여러 번 호출해도 한 번만 설정)"""
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(DebugSamplingFilter(debug_sample_rate))
+    queue_handler.addFilter(RequestIdFilter())
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter() if json_format else TextFormatter())
+
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(level.upper())
+    app_logger.handlers = [queue_handler]
+    app_logger.propagate = False
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """남은 레코드를 모두 출력하고 리스너 스레드를 멈춘다."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class RequestIdMiddleware:
+    """요청마다 request_id 를 정해서 로그 컨텍스트에 넣고 X-Request-ID 응답 헤더로 돌려준다. (순수 ASGI)"""
+
+    header = b"x-request-id"
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == self.header:
+                # 외부에서 들어온 값은 길이를 제한한다. (로그 오염 방지)
+                request_id = value.decode("latin-1")[:64] or None
+                break
+        request_id = request_id or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(self.header, request_id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
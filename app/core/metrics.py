@@ -0,0 +1,304 @@
+import logging
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+""" 계측(Instrumentation)
+- 외부 의존성 없이 Prometheus text format(0.0.4)으로 내보내는 최소한의 Counter/Gauge/Histogram 구현
+- MetricsMiddleware: 라우트(경로 템플릿)별 지연시간 히스토그램, 상태코드별 요청 수
+- install_engine_metrics: ASYNC_ENGINE 에 SQLAlchemy 이벤트를 걸어 요청별 쿼리 수/DB 시간/커넥션 점유 시간, 커넥션 풀 상태를 수집
+- 노출: GET /metrics (app/views/metrics.py)
+"""
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _format_labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        REGISTRY.register(self)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(labels.get(n, "") for n in self.labelnames)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self._values: dict[tuple, float] = {}
+        super().__init__(name, documentation, labelnames)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self):
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in self._values.items()]
+
+
+class Gauge(_Metric):
+    """set()/inc()/dec() 로 값을 직접 바꾸거나, set_function() 으로 수집 시점에 값을 읽는다."""
+    type_name = "gauge"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self._values: dict[tuple, float] = {}
+        self._functions: dict[tuple, callable] = {}
+        super().__init__(name, documentation, labelnames)
+
+    def set(self, value: float, **labels):
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def set_function(self, func, **labels):
+        self._functions[self._key(labels)] = func
+
+    def value(self, **labels) -> float:
+        key = self._key(labels)
+        if key in self._functions:
+            return self._functions[key]()
+        return self._values.get(key, 0.0)
+
+    def _samples(self):
+        values = dict(self._values)
+        for key, func in self._functions.items():
+            values[key] = func()
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in values.items()]
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # key -> [bucket counts..., sum, count]
+        self._values: dict[tuple, list[float]] = {}
+        super().__init__(name, documentation, labelnames)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        state = self._values.get(key)
+        if state is None:
+            state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+        state[bisect_left(self.buckets, value)] += 1
+        state[-2] += value
+        state[-1] += 1
+
+    def snapshot(self, **labels) -> dict:
+        """버킷별 누적 개수/합계/개수 (관리용 API 에서 분포를 보여줄 때 사용)"""
+        state = self._values.get(self._key(labels))
+        if state is None:
+            return {"buckets": {}, "sum": 0.0, "count": 0}
+        cumulative, buckets = 0, {}
+        for bound, count in zip(self.buckets, state):
+            cumulative += count
+            buckets[_format_value(bound)] = cumulative
+        return {"buckets": buckets, "sum": state[-2], "count": state[-1]}
+
+    def _samples(self):
+        lines = []
+        for key, state in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{labels} {state[-1]}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"duplicate metric: {metric.name}")
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = Counter("http_requests_total", "HTTP 요청 수", ("method", "route", "status"))
+HTTP_LATENCY = Histogram("http_request_duration_seconds", "HTTP 요청 처리 시간", ("method", "route"))
+HTTP_IN_PROGRESS = Gauge("http_requests_in_progress", "처리 중인 HTTP 요청 수")
+
+DB_QUERIES = Counter("db_queries_total", "실행된 SQL 문 수", ("route",))
+DB_QUERIES_PER_REQUEST = Histogram("db_queries_per_request", "요청당 SQL 문 수", ("route",), buckets=COUNT_BUCKETS)
+DB_TIME_PER_REQUEST = Histogram("db_time_per_request_seconds", "요청당 SQL 실행 시간 합계", ("route",))
+
+DB_POOL_CHECKOUT_WAIT = Histogram("db_pool_checkout_wait_seconds", "커넥션 풀 checkout 대기 시간",
+                                  buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0))
+DB_POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "사용 중인 커넥션 수")
+DB_POOL_CHECKED_IN = Gauge("db_pool_checked_in", "풀에서 대기 중인(idle) 커넥션 수")
+DB_POOL_OVERFLOW = Gauge("db_pool_overflow", "pool_size 를 넘어 만든 overflow 커넥션 수")
+DB_POOL_SIZE = Gauge("db_pool_size", "설정된 pool_size")
+DB_SESSION_BINDS = Counter("db_session_binds_total", "세션이 쿼리를 보낸 대상(primary/replica)", ("target",))
+DB_REPLICA_HEALTHY = Gauge("db_replica_healthy", "복제본 헬스체크 결과 (1=정상)", ("replica",))
+DB_CONN_HOLD = Histogram("db_connection_hold_seconds", "커넥션 checkout 부터 checkin 까지 점유 시간")
+DB_CONN_HOLD_PER_REQUEST = Histogram("db_connection_hold_per_request_seconds", "요청당 커넥션 점유 시간 합계", ("route",))
+
+
+@dataclass
+class RequestStats:
+    route: str = "<unmatched>"
+    queries: int = 0
+    db_time: float = 0.0
+    conn_hold: float = 0.0
+
+
+# 요청 단위 통계. SQLAlchemy 비동기 실행은 같은 컨텍스트를 공유하므로 엔진 이벤트에서 그대로 읽을 수 있다.
+request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+class MetricsMiddleware:
+    """순수 ASGI 미들웨어 (BaseHTTPMiddleware 는 스트리밍 응답을 감싸며 오버헤드가 있어 사용하지 않는다)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        status_code = 500
+        start = time.perf_counter()
+        HTTP_IN_PROGRESS.inc()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_IN_PROGRESS.dec()
+            # FastAPI 라우터가 매칭한 라우트를 scope 에 넣어준다. 경로 파라미터 대신 템플릿을 써서 라벨 수를 제한한다.
+            route = scope.get("route")
+            stats.route = getattr(route, "path", None) or "<unmatched>"
+            method = scope["method"]
+            HTTP_REQUESTS.inc(method=method, route=stats.route, status=str(status_code))
+            HTTP_LATENCY.observe(elapsed, method=method, route=stats.route)
+            DB_QUERIES_PER_REQUEST.observe(stats.queries, route=stats.route)
+            DB_TIME_PER_REQUEST.observe(stats.db_time, route=stats.route)
+            DB_CONN_HOLD_PER_REQUEST.observe(stats.conn_hold, route=stats.route)
+            DB_QUERIES.inc(stats.queries, route=stats.route)
+            request_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_times = conn.info.get("query_start_time")
+    elapsed = time.perf_counter() - start_times.pop() if start_times else 0.0
+    stats = request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += elapsed
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    connection_record.info["checkout_time"] = time.perf_counter()
+
+
+def _on_checkin(dbapi_connection, connection_record):
+    start = connection_record.info.pop("checkout_time", None)
+    if start is None:
+        return
+    held = time.perf_counter() - start
+    DB_CONN_HOLD.observe(held)
+    stats = request_stats.get()
+    if stats is not None:
+        stats.conn_hold += held
+
+
+def install_engine_metrics(async_engine, pool_gauges: bool = True):
+    """ASYNC_ENGINE 에 쿼리 카운터와 풀 상태 게이지를 연결한다. (복제본 엔진은 pool_gauges=False 로 쿼리 계측만)"""
+    sync_engine = async_engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(sync_engine, "checkout", _on_checkout)
+        event.listen(sync_engine, "checkin", _on_checkin)
+
+    pool = sync_engine.pool
+    if pool_gauges and isinstance(pool, QueuePool):
+        DB_POOL_CHECKED_OUT.set_function(pool.checkedout)
+        DB_POOL_CHECKED_IN.set_function(pool.checkedin)
+        DB_POOL_OVERFLOW.set_function(lambda: max(pool.overflow(), 0))
+        DB_POOL_SIZE.set_function(pool.size)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """checkout 대기 시간을 측정하는 풀. (풀이 가득 차면 _do_get 에서 pool_timeout 까지 기다린다)"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
+# SQLAlchemy 는 풀 로거 이름을 풀 클래스의 모듈로 만든다. (app.core.metrics.TimedQueuePool)
+# app 로거를 DEBUG 로 올려도 checkout/checkin 마다 찍히는 풀 로그가 섞이지 않도록 WARNING 으로 고정한다.
+logging.getLogger(f"{__name__}.{TimedQueuePool.__name__}").setLevel(logging.WARNING)
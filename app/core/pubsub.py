@@ -0,0 +1,156 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable
+
+from pydantic import BaseModel
+
+from app.core.metrics import Gauge, Counter
+
+try:
+    import redis.asyncio as aioredis
+except ImportError: # 선택 의존성: 워커가 하나면 필요 없다.
+    aioredis = None
+
+""" 프로세스 내 pub/sub (질문 상세 실시간 갱신용)
+- 서비스가 commit 한 뒤 publish(topic, event, data) 하면 그 topic 을 구독 중인 SSE 연결들의 큐에 들어간다.
+- 워커(프로세스)가 여러 개면 다른 워커의 구독자에게도 전달되어야 하므로 backend 를 바꿔 끼운다.
+  LocalBackend(기본): 같은 프로세스에만 전달 / RedisBackend: Redis PUBLISH -> 모든 워커가 PSUBSCRIBE 로 받아서 전달
+- 메시지는 "event\\n{json}" 문자열 하나로 한 번만 직렬화해서 구독자 수와 무관하게 재사용한다.
+- 느린 구독자의 큐가 가득 차면 쌓인 이벤트를 버리고 resync 이벤트 하나만 남긴다. (클라이언트가 다시 읽는다)
+"""
+
+logger = logging.getLogger(__name__)
+
+PUBSUB_SUBSCRIBERS = Gauge("pubsub_subscribers", "현재 구독(SSE 연결) 수")
+PUBSUB_PUBLISHED = Counter("pubsub_published_total", "발행한 이벤트 수", ("event",))
+PUBSUB_DROPPED = Counter("pubsub_dropped_total", "큐가 가득 차서 resync 로 대체된 구독 수")
+
+RESYNC = "resync\n{}"
+
+
+class LocalBackend:
+    """같은 프로세스의 구독자에게만 바로 전달한다."""
+
+    def __init__(self):
+        self._deliver: Callable[[str, str], None] | None = None
+
+    async def start(self, deliver: Callable[[str, str], None]):
+        self._deliver = deliver
+
+    async def stop(self):
+        self._deliver = None
+
+    def publish(self, topic: str, message: str):
+        if self._deliver is not None:
+            self._deliver(topic, message)
+
+
+class RedisBackend:
+    """Redis 채널로 워커 사이에 전달한다. 자기 자신이 보낸 메시지도 Redis 를 거쳐 받는다."""
+
+    def __init__(self, url: str, prefix: str = "pubsub:"):
+        if aioredis is None:
+            raise RuntimeError("PUBSUB_REDIS_URL 을 사용하려면 redis 패키지를 설치해야 합니다. (pip install redis)")
+        self.url = url
+        self.prefix = prefix
+        self._redis = None
+        self._pubsub = None
+        self._listener: asyncio.Task | None = None
+        self._pending: set[asyncio.Task] = set()
+
+    async def start(self, deliver: Callable[[str, str], None]):
+        self._redis = aioredis.from_url(self.url, decode_responses=True)
+        self._pubsub = self._redis.pubsub()
+        await self._pubsub.psubscribe(self.prefix + "*")
+        self._listener = asyncio.create_task(self._listen(deliver))
+
+    async def _listen(self, deliver: Callable[[str, str], None]):
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    if message["type"] == "pmessage":
+                        deliver(message["channel"][len(self.prefix):], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Redis pub/sub listener failed, reconnecting")
+                await asyncio.sleep(1)
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+        if self._redis is not None:
+            await self._redis.aclose()
+
+    def publish(self, topic: str, message: str):
+        # 쓰기 요청이 Redis 왕복을 기다리지 않도록 백그라운드로 보낸다.
+        task = asyncio.create_task(self._redis.publish(self.prefix + topic, message))
+        self._pending.add(task)
+        task.add_done_callback(self._published)
+
+    def _published(self, task: asyncio.Task):
+        self._pending.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Redis publish failed: %s", task.exception())
+
+
+class PubSub:
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self.backend = LocalBackend()
+        self._subscribers: dict[str, set[asyncio.Queue]] = defaultdict(set)
+        PUBSUB_SUBSCRIBERS.set_function(lambda: sum(len(queues) for queues in self._subscribers.values()))
+
+    async def start(self, backend=None, queue_size: int | None = None):
+        if backend is not None:
+            self.backend = backend
+        if queue_size is not None:
+            self.queue_size = queue_size
+        await self.backend.start(self._deliver)
+
+    async def stop(self):
+        await self.backend.stop()
+
+    def publish(self, topic: str, event: str, data: BaseModel | dict):
+        """commit 이 끝난 뒤에 호출한다. (롤백된 변경이 나가지 않도록)"""
+        if isinstance(data, BaseModel):
+            payload = data.model_dump_json()
+        else:
+            payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str)
+        PUBSUB_PUBLISHED.inc(event=event)
+        self.backend.publish(topic, f"{event}\n{payload}")
+
+    def _deliver(self, topic: str, message: str):
+        for queue in self._subscribers.get(topic, ()):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                PUBSUB_DROPPED.inc()
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC)
+
+    @asynccontextmanager
+    async def subscribe(self, topic: str) -> AsyncIterator[asyncio.Queue]:
+        """topic 의 메시지("event\\n{json}")를 받는 큐. 컨텍스트를 벗어나면 구독이 해제된다."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[topic].add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers.get(topic)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[topic]
+
+
+pubsub = PubSub()
@@ -1,3 +1,4 @@
+import time
 from typing import Optional, Set
 
 from fastapi import Depends, HTTPException, Request, status, Response, Security
@@ -5,16 +6,34 @@ from fastapi import Depends, HTTPException, Request, status, Response, Security
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer, OAuth2PasswordBearer
 from jose import jwt, JWTError
 from jose.exceptions import ExpiredSignatureError
-from sqlalchemy import select
+from sqlalchemy import select, event
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.apis.auth import SECRET_KEY, ALGORITHM
+from app.core.config import get_config
 from app.core.database import get_db
 from app.models.user import User
+from app.schemas.auth import CurrentUser
 from app.services.auth_service import AuthService, get_auth_service
+from app.utils.cache import TTLCache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/apis/auth/login")
 
+config = get_config()
+
+# 토큰 문자열 -> CurrentUser 스냅샷. 캐시 적중 시 jwt.decode 와 users 조회를 모두 건너뛴다.
+principal_cache = TTLCache(maxsize=config.AUTH_CACHE_MAXSIZE, ttl=config.AUTH_CACHE_TTL)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_principal(mapper, connection, target):
+    """ORM flush 로 사용자 정보가 바뀌면 이 워커의 캐시에서 즉시 제거.
+    Core update() 는 이 이벤트를 거치지 않으므로 호출한 쪽에서 principal_cache.invalidate_tag 를 부른다. (비밀번호 변경, logout-all)
+    다른 워커는 TTL 만료 후 DB 의 token_version 과 다시 비교하게 된다."""
+    principal_cache.invalidate_tag(target.id)
+
+
 """
 토큰에서 현재 사용자 정보를 가져오는 의존성 함수
 """
@@ -23,13 +42,17 @@ async def get_current_user(
         request: Request, response: Response,
         token: str = Depends(oauth2_scheme),
         db: AsyncSession = Depends(get_db),
-):
+) -> CurrentUser:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="인증되지 않은 사용자입니다.",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    cached = principal_cache.get(token)
+    if cached is not None:
+        return cached
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
@@ -38,20 +61,28 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     else:
-        query = (select(User).where(User.username == username))
+        query = (select(User.id, User.username, User.email, User.token_version).where(User.username == username))
         result = await db.execute(query)
-        user = result.scalar_one_or_none()
+        user = result.one_or_none()
         if user is None:
             raise HTTPException(
                 status_code=401,
                 detail="사용자를 찾을 수 없습니다.",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        return user
+        # 토큰 버전이 다르면(비밀번호 변경 등으로 token_version 이 올라감) 기존 토큰은 무효
+        if payload.get("ver", 0) != user.token_version:
+            raise credentials_exception
+
+        current_user = CurrentUser.model_validate(user)
+        # 토큰 만료 시각을 넘겨서 캐시하지 않는다.
+        ttl = payload["exp"] - time.time() if "exp" in payload else None
+        principal_cache.set(token, current_user, ttl=ttl, tag=current_user.id)
+        return current_user
 
 
 async def get_optional_current_user(request: Request, response: Response,
-                                    db: AsyncSession = Depends(get_db)) -> Optional[User]:
+                                    db: AsyncSession = Depends(get_db)) -> Optional[CurrentUser]:
     """
     인증 토큰이 없거나 유효하지 않은 경우 None을 반환하고, 다른 예외는 그대로 전달합니다.
     AI Chat:
@@ -68,3 +99,16 @@ async def get_optional_current_user(request: Request, response: Response,
         if e.status_code in (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN):
             return None
         raise
+
+
+ADMIN_USERNAMES = frozenset(name.strip() for name in (config.ADMIN_USERNAMES or "").split(",") if name.strip())
+
+
+async def get_current_admin(current_user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
+    """관리자 API 용: config.ADMIN_USERNAMES 에 등록된 사용자만 허용"""
+    if current_user.username not in ADMIN_USERNAMES:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="관리자 권한이 필요합니다.",
+        )
+    return current_user
@@ -1,7 +1,7 @@
 from datetime import datetime, timezone
 from typing import Optional
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import relationship, backref, Mapped, mapped_column
 
 from app.core.database import Base
@@ -10,6 +10,12 @@ from app.models.user import question_voter, answer_voter
 
 class Question(Base):
     __tablename__ = "questions"
+    __table_args__ = (
+        # 목록 정렬/키셋 페이지네이션 (키 desc, id desc) 용 복합 인덱스. 정렬마다 하나씩 두어 filesort 없이 역순으로 읽는다.
+        Index("ix_questions_created_at_id", "created_at", "id"), # sort=recent
+        Index("ix_questions_vote_count_id", "vote_count", "id"), # sort=votes
+        Index("ix_questions_last_activity_at_id", "last_activity_at", "id"), # sort=activity
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     subject: Mapped[str] = mapped_column(String(100), nullable=False) # String은 제한 글자수를 지정해야 한다.
@@ -17,17 +23,33 @@ class Question(Base):
 
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    # 최근 활동 시각 (sort=activity): 작성 시각으로 시작해서 답변 등록/수정 때 갱신된다. (AnswerService)
+    last_activity_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+
+    # 비정규화 카운터: voter/answers_all 컬렉션을 로드하지 않고 목록/정렬/상세에서 정수로 바로 읽는다.
+    # vote_question, create_answer, delete_answer 가 같은 트랜잭션에서 증감한다. (드리프트 복구: manage.py recount)
+    vote_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=text("0"))
+    answer_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=text("0"))
+    # 낙관적 동시성 제어: 수정할 때마다 1 증가. 클라이언트가 읽은 version 을 보내면 일치할 때만 수정된다.
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default=text("1"))
+    # 소프트 삭제 시각. 답변이 많은 질문은 요청 안에서 지우지 않고 표시만 한 뒤 백그라운드에서 나눠서 지운다.
+    # 값이 있으면 모든 조회에서 제외된다. (QuestionService.delete_question / purge_deleted_questions)
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
 
     # users.id에서 users는 테이블명
     # 외래키를 사용할 때, 제약 조건에 name을 ForeignKey 안에 ForeignKey("users.id", name="fk_author_id") 이렇게 넣어라.
     author_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", name="question_author_id", ondelete='CASCADE'), nullable=True)
     # author_id가 nullable=True 이므로 Optional["User"]가 일관됩니다.
     author: Mapped["User"] = relationship("User", backref=backref("question_users",
-                                                                  lazy="selectin",
+                                                                  lazy="select",
                                                                   cascade="all, delete-orphan",
                                                                   passive_deletes=True), lazy="selectin")
     # 1. 모델 관계에 비동기에서는 lazy='selectin' 기본 적용 안그러면 빙글빙글 돈다.
-    voter = relationship('User', secondary=question_voter, backref='question_voters', lazy="selectin") # 1. 모델 관계에 lazy='selectin' 기본 적용 안그러면 빙글빙글 돈다.
+    # 단, User 쪽 역참조(question_users, answer_users)는 lazy="select" 로 두어서 select(User) 가
+    # 그 사용자의 모든 질문/답변(및 그 답변/추천자)까지 연쇄 로딩하지 않게 한다.
+    # 필요할 때만 await user.awaitable_attrs.question_users 로 읽는다.
+    voter = relationship('User', secondary=question_voter, backref=backref('question_voters', passive_deletes=True),
+                         lazy="selectin", passive_deletes=True) # 1. 모델 관계에 lazy='selectin' 기본 적용 안그러면 빙글빙글 돈다.
 
 """
     id = Column(Integer, primary_key=True)
@@ -40,6 +62,11 @@ class Question(Base):
 
 class Answer(Base):
     __tablename__ = "answers"
+    __table_args__ = (
+        # 질문별 답변 페이지(GET /apis/questions/{id}/answers)의 정렬/키셋 페이지네이션용 복합 인덱스
+        Index("ix_answers_question_id_created_at_id", "question_id", "created_at", "id"), # oldest/newest
+        Index("ix_answers_question_id_vote_count_id", "question_id", "vote_count", "id"), # votes
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     content: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
@@ -47,12 +74,17 @@ class Answer(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
+    # 비정규화 카운터: vote_answer 가 같은 트랜잭션에서 증가시킨다.
+    vote_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=text("0"))
+    # 낙관적 동시성 제어 (Question.version 참고)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default=text("1"))
+
     # users.id에서 users는 테이블명
     # 외래키를 사용할 때, 제약 조건에 name을 ForeignKey 안에 ForeignKey("users.id", name="fk_author_id") 이렇게 넣어라.
     author_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", name="answer_author_id", ondelete='CASCADE'), nullable=True)
     # author_id가 nullable=True 이므로 Optional["User"]가 일관됩니다.
     author: Mapped["User"] = relationship("User", backref=backref("answer_users",
-                                                                  lazy="selectin",
+                                                                  lazy="select",
                                                                   cascade="all, delete-orphan",
                                                                   passive_deletes=True), lazy="selectin")
 
@@ -63,7 +95,8 @@ class Answer(Base):
                                                                   cascade="all, delete-orphan",
                                                                   passive_deletes=True), lazy="selectin")
     # 1. 모델 관계에 비동기에서는 lazy='selectin' 기본 적용 안그러면 빙글빙글 돈다.
-    voter = relationship('User', secondary=answer_voter, backref='answer_voters', lazy="selectin")
+    voter = relationship('User', secondary=answer_voter, backref=backref('answer_voters', passive_deletes=True),
+                         lazy="selectin", passive_deletes=True)
 
     '''
     question 속성은 답변 모델에서 질문 모델을 참조하기 위해 추가했다. 
@@ -0,0 +1,28 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Integer, String, Text, DateTime, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class QuestionSearchDocument(Base):
+    """질문 1건당 1행으로 유지되는 비정규화 검색 문서.
+    질문 제목/본문/작성자 + 모든 답변 본문/답변 작성자를 HTML 태그를 제거한 평문으로 합쳐 둔다.
+    질문 작성 시 같은 트랜잭션에서 만들고, 이후 질문/답변이 바뀌면 commit 뒤 후처리 잡(reindex_question)이 upsert 로 다시 만든다.
+
+    MySQL 에서는 FULLTEXT(ngram parser) 인덱스로 MATCH ... AGAINST 검색을 하므로
+    5개 테이블 outer join + ILIKE '%keyword%' 풀스캔 없이 게시판 크기와 무관하게 검색 지연이 일정하다.
+    (ngram parser: 공백으로 단어가 나뉘지 않는 한글 검색을 위해 필요)
+    """
+    __tablename__ = "question_search_documents"
+    __table_args__ = (
+        Index("ft_question_search_subject", "subject", mysql_prefix="FULLTEXT", mysql_with_parser="ngram"),
+        Index("ft_question_search_document", "document", mysql_prefix="FULLTEXT", mysql_with_parser="ngram"),
+    )
+
+    question_id: Mapped[int] = mapped_column(Integer, ForeignKey("questions.id", name="fk_search_question_id", ondelete='CASCADE'), primary_key=True)
+    subject: Mapped[str] = mapped_column(String(100), nullable=False)
+    document: Mapped[str] = mapped_column(Text, nullable=False)
+
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
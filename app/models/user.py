@@ -1,7 +1,7 @@
 from datetime import datetime, timezone
 from typing import List, Optional
 
-from sqlalchemy import Integer, String, DateTime, func, Table, Column, ForeignKey, UniqueConstraint
+from sqlalchemy import Integer, String, DateTime, func, Table, Column, ForeignKey, UniqueConstraint, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -14,15 +14,20 @@ class User(Base):
     username: Mapped[str] = mapped_column(String(20), unique=True, index=True, nullable=False)
     email: Mapped[str] = mapped_column(String(100), unique=True, index=True, nullable=False)
     password: Mapped[str] = mapped_column(String(100), nullable=False)
+    # 토큰 버전: 발급된 JWT 의 "ver" 클레임과 비교한다. 값을 올리면 기존 토큰이 모두 무효가 된다.
+    # (각 워커의 principal 캐시에는 최대 AUTH_CACHE_TTL 초까지 남을 수 있다.)
+    token_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=text("0"))
 
     created_at: Mapped[str] = mapped_column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
     updated_at: Mapped[str] = mapped_column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
 
+# 추천 연관 테이블은 ON DELETE CASCADE: 질문/답변/사용자를 지우면 DB 가 추천 행을 함께 지운다.
+# (ORM 쪽 relationship 은 passive_deletes=True 로 두어서 행을 읽어 한 건씩 지우지 않는다)
 question_voter = Table('question_voter',
                        Base.metadata,
-                       Column('user_id', Integer, ForeignKey('users.id'), primary_key=True),
-                       Column('question_id', Integer, ForeignKey('questions.id'), primary_key=True),
+                       Column('user_id', Integer, ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+                       Column('question_id', Integer, ForeignKey('questions.id', ondelete='CASCADE'), primary_key=True),
                        # 중복 등록 방지(복합 PK로 이미 보장되지만, 이름 있는 제약 예시)
                        UniqueConstraint("user_id", "question_id", name="uq_question_voter")
                        )
@@ -30,8 +35,8 @@ question_voter = Table('question_voter',
 
 answer_voter = Table('answer_voter',
                      Base.metadata,
-                     Column('user_id', Integer, ForeignKey('users.id'), primary_key=True),
-                     Column('answer_id', Integer, ForeignKey('answers.id'), primary_key=True),
+                     Column('user_id', Integer, ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+                     Column('answer_id', Integer, ForeignKey('answers.id', ondelete='CASCADE'), primary_key=True),
                      # 중복 등록 방지(복합 PK로 이미 보장되지만, 이름 있는 제약 예시)
                      UniqueConstraint("user_id", "answer_id", name="uq_answer_voter")
                      )
@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+
+
+class Distribution(BaseModel):
+    """Histogram.snapshot(): 상한(le)별 누적 개수, 합계, 개수"""
+    buckets: dict[str, int] = {}
+    sum: float = 0.0
+    count: int = 0
+
+
+class PoolStats(BaseModel):
+    name: str
+    size: int
+    checked_out: int
+    checked_in: int # idle
+    overflow: int
+    max_overflow: int
+    timeout: float
+    recycle: int
+    pre_ping: bool
+
+
+class PoolReport(BaseModel):
+    pools: list[PoolStats]
+    checkout_wait: Distribution # 모든 엔진의 checkout 대기 시간 분포
+    connection_hold: Distribution # checkout ~ checkin 점유 시간 분포
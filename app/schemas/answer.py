@@ -1,14 +1,18 @@
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Literal
 
 from pydantic import BaseModel, field_validator, ConfigDict
 from pydantic_core import PydanticCustomError
 
 from app.schemas.user import UserOrm
 
+# 답변 페이지 정렬: 오래된순(기본, 기존 상세 화면 순서), 최신순, 추천순
+AnswerSort = Literal["oldest", "newest", "votes"]
+
 
 class AnswerIn(BaseModel):
     content: str
+    version: int | None = None # 수정 시 선택 (QuestionIn.version 참고)
 
     @field_validator('content')
     def not_empty(cls, v):
@@ -29,8 +33,24 @@ class AnswerOut(BaseModel):
     author: Optional[UserOrm] = None
     question_id: int
     voter: list[UserOrm] = []
+    vote_count: int = 0
+    version: int = 1
     model_config = ConfigDict(from_attributes=True)
 
+
+class AnswerUpdateOut(BaseModel):
+    """수정 응답 (QuestionUpdateOut 참고)"""
+    id: int
+    content: str
+    updated_at: datetime
+    version: int
+
+
+class AnswerList(BaseModel):
+    total: int | None = 0 # 질문의 answer_count
+    answer_list: list[AnswerOut] = []
+    next_cursor: str | None = None # 다음 페이지 커서, 마지막 페이지면 None
+
     """
     - model_config = ConfigDict(from_attributes=True)의 의미
         - Pydantic v2 방식입니다.
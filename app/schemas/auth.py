@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 class LoginRequest(BaseModel):
     email: str
@@ -8,4 +8,14 @@ class LoginRequest(BaseModel):
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str
-    username: str
\ No newline at end of file
+    username: str
+
+
+class CurrentUser(BaseModel):
+    """인증 의존성(get_current_user)이 돌려주는 최소 신원 정보.
+    User ORM 객체(및 그 관계 그래프) 대신 필요한 컬럼만 조회해서 요청당 인증 비용을 일정하게 유지한다."""
+    id: int
+    username: str
+    email: str
+    token_version: int = 0
+    model_config = ConfigDict(from_attributes=True, frozen=True)
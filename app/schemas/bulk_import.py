@@ -0,0 +1,56 @@
+from datetime import datetime
+
+from pydantic import BaseModel, model_validator
+
+from app.schemas.answer import AnswerIn
+from app.schemas.question import QuestionIn
+from app.schemas.user import UserIn
+
+""" NDJSON 일괄 가져오기 한 줄 형식 (기존 입력 스키마의 검증 규칙을 그대로 상속한다)
+{"type": "user", "username": "...", "email": "...", "password": "..."}   # password1/password2 도 가능
+{"type": "question", "id": 1, "subject": "...", "content": "...", "author": "username",
+ "created_at": "...", "answers": [{"content": "...", "author": "username", "created_at": "..."}]}
+type 이 없으면 question. manage.py export / GET /apis/admin/export 출력은 그대로 다시 가져올 수 있다.
+(추천 수, 답변 id 등 나머지 필드는 무시한다)
+"""
+
+
+class UserImport(UserIn):
+    @model_validator(mode="before")
+    @classmethod
+    def single_password(cls, data):
+        # 이관 데이터는 비밀번호가 하나뿐이므로 password 하나만 있으면 password1/password2 로 채운다.
+        if isinstance(data, dict) and "password" in data and "password1" not in data:
+            data = {**data, "password1": data["password"], "password2": data["password"]}
+        return data
+
+
+class AnswerImport(AnswerIn):
+    author: str | None = None # 작성자 username (없거나 찾지 못하면 작성자 없음)
+    created_at: datetime | None = None
+
+
+class QuestionImport(QuestionIn):
+    id: int # 원본 id 를 그대로 쓴다. (답변이 참조하고, 기존 URL 을 유지하기 위해)
+    author: str | None = None
+    created_at: datetime | None = None
+    answers: list[AnswerImport] = []
+
+
+class ImportLineError(BaseModel):
+    line: int
+    detail: str
+
+
+class ImportReport(BaseModel):
+    lines: int = 0 # 읽은 줄 수 (skip_lines 로 건너뛴 줄 포함)
+    committed_lines: int = 0 # 이 줄까지 commit 됨. 중단됐으면 다음 실행의 skip_lines 로 넘긴다.
+    users: int = 0
+    skipped_users: int = 0 # username/email 이 이미 있는 사용자
+    questions: int = 0
+    answers: int = 0
+    invalid: int = 0 # 검증에 실패해서 건너뛴 줄 수
+    errors: list[ImportLineError] = [] # 앞쪽 일부만 담는다.
+    aborted: str | None = None # 배치 INSERT 가 실패해서 중단된 이유
+    elapsed: float = 0.0 # 초
+    rows_per_sec: float = 0.0 # (users + questions + answers) / elapsed
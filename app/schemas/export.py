@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class AnswerExport(BaseModel):
+    id: int
+    content: str | None = None
+    author: str | None = None # 작성자 username
+    created_at: datetime
+    updated_at: datetime
+    vote_count: int = 0
+
+
+class QuestionExport(BaseModel):
+    """NDJSON 내보내기 한 줄: 질문 하나와 그 답변 전체, 추천 수"""
+    id: int
+    subject: str
+    content: str
+    author: str | None = None # 작성자 username
+    created_at: datetime
+    updated_at: datetime
+    last_activity_at: datetime | None = None
+    vote_count: int = 0
+    answer_count: int = 0
+    answers: list[AnswerExport] = []
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Literal
 
 from pydantic import BaseModel, field_validator, ConfigDict, Field
 from pydantic_core import PydanticCustomError
@@ -7,10 +7,15 @@ from pydantic_core import PydanticCustomError
 from app.schemas.answer import AnswerOut
 from app.schemas.user import UserOrm
 
+# 목록 정렬: 최신 등록순(기본), 추천순, 최근 활동순(답변 등록/수정이 스레드를 끌어올림)
+QuestionSort = Literal["recent", "votes", "activity"]
+
 
 class QuestionIn(BaseModel):
     subject: str
     content: str
+    # 수정 시 선택: 읽어 온 version 을 보내면 그 사이 다른 수정이 있었을 때 409 로 거절된다. (생성 시 무시)
+    version: int | None = None
 
     @field_validator('subject', 'content')
     def not_empty(cls, v):
@@ -31,11 +36,51 @@ class QuestionOut(BaseModel):
     answers_all: list[AnswerOut] = []
     author: Optional[UserOrm] = None
     voter: list[UserOrm] = []
+    vote_count: int = 0
+    answer_count: int = 0
+    version: int = 1
+    last_activity_at: datetime | None = None
+    model_config = ConfigDict(from_attributes=True)
+
+
+class QuestionDetailOut(QuestionOut):
+    """상세 answers=page 응답: answers_all 에는 답변 첫 페이지만 담고, 나머지는
+    GET /apis/questions/{id}/answers?cursor=answers_next_cursor 로 이어 읽는다."""
+    answers_next_cursor: str | None = None
+
+
+class QuestionUpdateOut(BaseModel):
+    """수정 응답: 조건부 UPDATE 한 문장으로 처리하므로 답변/추천자 목록을 다시 읽지 않고 바뀐 필드만 돌려준다.
+    version 은 항상 수정 후의 새 값이다. (다음 조건부 수정에 그대로 보낸다)"""
+    id: int
+    subject: str
+    content: str
+    updated_at: datetime
+    version: int
+
+
+class QuestionSummary(BaseModel):
+    """목록 화면용 요약. 답변/추천자 목록 대신 개수만 담아서, 스레드 크기와 무관하게 응답 크기가 일정하다."""
+    id: int
+    subject: str | None = None
+    author_name: str | None = None
+    created_at: datetime
+    answer_count: int = 0
+    vote_count: int = 0
+    last_activity_at: datetime | None = None
     model_config = ConfigDict(from_attributes=True)
 
+
+class QuestionSummaryList(BaseModel):
+    total: int | None = 0
+    question_list: list[QuestionSummary] = []
+    next_cursor: str | None = None
+
+
 class QuestionList(BaseModel):
-    total: int = 0
+    total: int | None = 0 # include_total=false 로 요청하면 count 쿼리를 생략하고 None
     question_list: list[QuestionOut] = []
+    next_cursor: str | None = None # 다음 페이지 커서(키셋 페이지네이션), 마지막 페이지면 None
 
     '''
     Answer 모델은 Question 모델과 answers_all 라는 이름으로 연결되어 있다. 
@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class SearchHit(BaseModel):
+    id: int
+    subject: str
+    author_name: str | None = None
+    created_at: datetime
+    score: float = 0.0
+    snippet: str = ""
+
+
+class SearchResult(BaseModel):
+    total: int = 0
+    results: list[SearchHit] = []
@@ -10,6 +10,9 @@ class UserBase(BaseModel):
 
 class UserOrm(UserBase):
     id: int
+    # 응답용: DB 에 저장된 이메일은 가입 시(UserIn) 이미 검증됐다. EmailStr 로 다시 검증하면
+    # 질문 상세의 작성자/추천자마다 email_validator 가 돌아서 직렬화 시간의 대부분을 차지한다.
+    email: str
     model_config = ConfigDict(from_attributes=True)
 
 class UserIn(UserBase):
@@ -34,5 +37,23 @@ class UserIn(UserBase):
 
 class UserOut(UserBase):
     id: int
+    email: str # UserOrm 과 같은 이유로 응답에서는 재검증하지 않는다.
     created_at: datetime
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class PasswordChangeIn(BaseModel):
+    current_password: str
+    password1: str
+    password2: str
+
+    @field_validator('current_password', 'password1', 'password2')
+    def not_empty(cls, v):
+        if not v or not v.strip():
+            raise PydanticCustomError('empty_value', '빈 값은 허용되지 않습니다.')
+        return v
+
+    @field_validator('password2')
+    def passwords_match(cls, v, info: FieldValidationInfo):
+        if 'password1' in info.data and v != info.data['password1']:
+            raise PydanticCustomError('empty_value', '비밀번호가 일치하지 않습니다.')
+        return v
@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class VoteOut(BaseModel):
+    """추천 응답: 이번 요청으로 추천이 기록됐는지(본인 글이거나 이미 추천했으면 False)와 현재 추천 수"""
+    recorded: bool
+    vote_count: int
@@ -1,83 +1,221 @@
+from datetime import datetime, timezone
+
 from fastapi import Depends
-from sqlalchemy import select, and_
+from sqlalchemy import select, update, literal, or_, and_, delete
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import noload
 
 from app.core.database import get_db
+from app.core.pubsub import pubsub
 from app.models.qua import Answer, Question
-from app.models.user import User, answer_voter
-from app.schemas.answer import AnswerIn
+from app.models.user import answer_voter
+from app.schemas.auth import CurrentUser
+from app.schemas.answer import AnswerIn, AnswerOut, AnswerUpdateOut, AnswerSort
+from app.schemas.user import UserOrm
+from app.schemas.vote import VoteOut
+from app.services.question_service import check_write_miss, execute_versioned_update, question_topic
+from app.services.search_service import enqueue_reindex
+from app.utils.etag import make_etag
+from app.utils.pagination import encode_cursor, decode_cursor, parse_cursor_datetime, InvalidCursorError
+
+# 정렬별 (정렬 키, 내림차순 여부). 동점은 id 로 같은 방향 정렬한다.
+_ANSWER_SORTS = {
+    "oldest": (Answer.created_at, False),
+    "newest": (Answer.created_at, True),
+    "votes": (Answer.vote_count, True),
+}
+
+
+def question_alive():
+    """답변의 질문이 소프트 삭제되지 않았는지 (상관 EXISTS). 소프트 삭제된 질문의 답변은 없는 것으로 본다."""
+    return select(Question.id).where(Question.id == Answer.question_id, Question.deleted_at.is_(None)).exists()
 
 
 class AnswerService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def create_answer(self, question: Question, answer_in: AnswerIn, user: User):
-        create_answer = Answer(**answer_in.model_dump())
-        create_answer.question_id = question.id
+    async def create_answer(self, question_id: int, answer_in: AnswerIn, user: CurrentUser) -> AnswerOut | None:
+        """질문을 미리 읽지 않는다. 카운터 UPDATE 의 rowcount 로 질문 존재를 확인하고 INSERT 한다.
+        refresh 없이 알고 있는 값으로 응답을 만든다. 질문이 없으면 None"""
+        # 비정규화 카운터 증가 + 최근 활동 시각 갱신 (같은 트랜잭션), updated_at 은 유지
+        now = datetime.now(timezone.utc)
+        result = await self.db.execute(
+            update(Question)
+            .where(Question.id == question_id, Question.deleted_at.is_(None))
+            .values(answer_count=Question.answer_count + 1, last_activity_at=now, updated_at=Question.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            await self.db.rollback()
+            return None
+
+        create_answer = Answer(**answer_in.model_dump(exclude={"version"}), created_at=now, updated_at=now)
+        create_answer.question_id = question_id
         create_answer.author_id = user.id
 
         self.db.add(create_answer)
+        await self.db.flush()
         await self.db.commit()
-        await self.db.refresh(create_answer)
+        # 검색 문서 갱신은 후처리 잡으로. 실행 시점의 최신 답변 목록으로 다시 만들므로,
+        # 동시에 달린 답변이 서로의 갱신을 덮어쓰지 않는다. (같은 질문의 대기 중인 재색인은 하나로 합쳐진다)
+        enqueue_reindex(question_id)
 
-        return create_answer
+        created = AnswerOut(
+            id=create_answer.id,
+            content=create_answer.content,
+            created_at=create_answer.created_at,
+            updated_at=create_answer.updated_at,
+            author=UserOrm(id=user.id, username=user.username, email=user.email),
+            question_id=question_id,
+            voter=[],
+            vote_count=0,
+            version=create_answer.version,
+        )
+        pubsub.publish(question_topic(question_id), "answer_created", created)
+        return created
 
     async def get_answer(self, answer_id: int):
-        query = (select(Answer).where(Answer.id == answer_id))
+        query = (select(Answer).where(Answer.id == answer_id, question_alive()))
         result = await self.db.execute(query)
         answer = result.scalar_one_or_none()
         return answer
 
-    async def update_answer(self, answer_id: int, answer_in: AnswerIn, user: User):
-        answer = await self.get_answer(answer_id)
-        if answer is None:
-            return None
-        if answer.author_id != user.id:
-            return False
-        answer.content = answer_in.content
-        await self.db.commit()
-        await self.db.refresh(answer)
-        return answer
+    async def get_answer_count(self, question_id: int) -> int | None:
+        """질문의 answer_count (비정규화 카운터). 질문이 없으면 None"""
+        return await self.db.scalar(
+            select(Question.answer_count).where(Question.id == question_id, Question.deleted_at.is_(None))
+        )
 
-    async def delete_answer(self, answer_id: int, user: User):
-        answer = await self.get_answer(answer_id)
-        if answer is None:
+    async def get_answers_by_cursor(self, question_id: int, cursor: str | None = None, limit: int = 20,
+                                    sort: AnswerSort = "oldest"):
+        """질문의 답변 한 페이지. (question_id, 정렬 키, id) 인덱스를 따라 커서 다음부터 limit 개만 읽는다.
+        (QuestionService.get_questions_by_cursor 참고) 반환: (답변 목록, next_cursor)"""
+        key, descending = _ANSWER_SORTS[sort]
+        # Answer.question 은 selectin 이라 그대로 두면 질문과 그 질문의 모든 답변을 다시 읽는다.
+        stmt = select(Answer).options(noload(Answer.question)).where(Answer.question_id == question_id)
+        if cursor:
+            values = decode_cursor(cursor, 2)
+            key_value = parse_cursor_datetime(values[0]) if key is Answer.created_at else values[0]
+            answer_id = values[1]
+            if not isinstance(key_value, (int, datetime)) or not isinstance(answer_id, int):
+                raise InvalidCursorError(cursor)
+            if descending:
+                stmt = stmt.where(or_(key < key_value, and_(key == key_value, Answer.id < answer_id)))
+            else:
+                stmt = stmt.where(or_(key > key_value, and_(key == key_value, Answer.id > answer_id)))
+
+        order_by = (key.desc(), Answer.id.desc()) if descending else (key.asc(), Answer.id.asc())
+        answers = list((await self.db.scalars(stmt.order_by(*order_by).limit(limit + 1))).all())
+
+        next_cursor = None
+        if len(answers) > limit:
+            answers = answers[:limit]
+            last = answers[-1]
+            next_cursor = encode_cursor(getattr(last, key.key), last.id)
+        return answers, next_cursor
+
+    async def get_answer_etag(self, answer_id: int) -> str | None:
+        """답변 상세 응답의 ETag (updated_at, vote_count). 답변이 없으면 None"""
+        query = select(Answer.updated_at, Answer.vote_count).where(Answer.id == answer_id, question_alive())
+        row = (await self.db.execute(query)).one_or_none()
+        if row is None:
             return None
-        if answer.author_id != user.id:
-            return False
-        await self.db.delete(answer)
+        return make_etag("answer", answer_id, *row)
+
+    async def update_answer(self, answer_id: int, answer_in: AnswerIn, user: CurrentUser):
+        """조건부 UPDATE 한 문장 (QuestionService.update_question 참고)
+        반환: AnswerUpdateOut, None(답변 없음), False(작성자 아님). version 불일치면 VersionConflictError"""
+        now = datetime.now(timezone.utc)
+        stmt = (
+            update(Answer)
+            .where(Answer.id == answer_id, Answer.author_id == user.id, question_alive())
+            .values(content=answer_in.content, updated_at=now, version=Answer.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        if answer_in.version is not None:
+            stmt = stmt.where(Answer.version == answer_in.version)
+        version = await execute_versioned_update(self.db, stmt, Answer, answer_id)
+        if version is None:
+            await self.db.rollback()
+            return await check_write_miss(self.db, Answer, answer_id, user, answer_in.version)
+
+        question_id = await self.db.scalar(select(Answer.question_id).where(Answer.id == answer_id))
+        await self.db.execute(
+            update(Question)
+            .where(Question.id == question_id)
+            .values(last_activity_at=now, updated_at=Question.updated_at)
+            .execution_options(synchronize_session=False)
+        )
         await self.db.commit()
-        return True
+        enqueue_reindex(question_id) # 검색 문서 재생성은 후처리 잡으로
+        updated = AnswerUpdateOut(
+            id=answer_id,
+            content=answer_in.content,
+            updated_at=now,
+            version=version,
+        )
+        pubsub.publish(question_topic(question_id), "answer_updated", updated)
+        return updated
 
-    async def vote_answer(self, answer_id: int, user: User):
-        answer = await self.get_answer(answer_id)
-        if answer is None:
+    async def delete_answer(self, answer_id: int, user: CurrentUser):
+        """작성자 확인은 (question_id, author_id) 만 읽고, DELETE 한 문장으로 지운다. (추천은 ON DELETE CASCADE)"""
+        row = (await self.db.execute(
+            select(Answer.question_id, Answer.author_id).where(Answer.id == answer_id, question_alive())
+        )).one_or_none()
+        if row is None:
             return None
-        if answer.author_id == user.id:
+        if row.author_id != user.id:
             return False
-        # 2) 이미 투표했는지 확인
 
-        query = select(answer_voter.c.user_id).where(
-                and_(answer_voter.c.answer_id == answer_id,
-                     answer_voter.c.user_id == user.id)
-            )
-        result = await self.db.execute(query)
-        exists = result.scalar_one_or_none()
-        if exists is not None:
-            # 이미 투표했다면 아무 것도 하지 않음(또는 에러 반환)
+        result = await self.db.execute(delete(Answer).where(Answer.id == answer_id, Answer.author_id == user.id))
+        if result.rowcount != 1:
+            await self.db.rollback()
             return None
-
-        # 3) 직접 연결 테이블에 insert (관계 접근 없음 -> MissingGreenlet 회피)
         await self.db.execute(
-            answer_voter.insert().values(
-                answer_id=answer_id,
-                user_id=user.id,
-            )
+            update(Question)
+            .where(Question.id == row.question_id)
+            .values(answer_count=Question.answer_count - 1, updated_at=Question.updated_at)
+            .execution_options(synchronize_session=False)
         )
         await self.db.commit()
-        await self.db.refresh(answer)
+        enqueue_reindex(row.question_id) # 검색 문서 재생성은 후처리 잡으로
+        pubsub.publish(question_topic(row.question_id), "answer_deleted", {"id": answer_id})
         return True
 
+    async def vote_answer(self, answer_id: int, user: CurrentUser):
+        """추천: 조건부 INSERT ... SELECT 한 문장으로 처리한다. (QuestionService.vote_question 참고)
+        반환: VoteOut(recorded=추천이 기록됐는지, 현재 추천 수), None(답변 없음)
+        """
+        source = (
+            select(literal(user.id), Answer.id)
+            .where(Answer.id == answer_id, question_alive(),
+                   or_(Answer.author_id.is_(None), Answer.author_id != user.id))
+        )
+        result = await self.db.execute(
+            answer_voter.insert()
+            .from_select(["user_id", "answer_id"], source)
+            .prefix_with("IGNORE", dialect="mysql")
+            .prefix_with("OR IGNORE", dialect="sqlite")
+        )
+        if result.rowcount != 1:
+            await self.db.rollback()
+            vote_count = await self.db.scalar(select(Answer.vote_count).where(Answer.id == answer_id, question_alive()))
+            return None if vote_count is None else VoteOut(recorded=False, vote_count=vote_count)
+
+        # 비정규화 카운터 증가 (같은 트랜잭션), 추천은 수정이 아니므로 updated_at 은 유지
+        await self.db.execute(
+            update(Answer)
+            .where(Answer.id == answer_id)
+            .values(vote_count=Answer.vote_count + 1, updated_at=Answer.updated_at)
+        )
+        row = (await self.db.execute(
+            select(Answer.question_id, Answer.vote_count).where(Answer.id == answer_id)
+        )).one()
+        await self.db.commit()
+        pubsub.publish(question_topic(row.question_id), "vote_changed",
+                       {"target": "answer", "id": answer_id, "vote_count": row.vote_count})
+        return VoteOut(recorded=True, vote_count=row.vote_count)
+
 def get_answer_service(db: AsyncSession = Depends(get_db)) -> 'AnswerService':
     return AnswerService(db)
\ No newline at end of file
@@ -1,3 +1,4 @@
+import logging
 from datetime import timedelta, datetime, timezone
 
 from fastapi import Depends, HTTPException, status
@@ -11,6 +12,8 @@ from app.models.user import User
 from app.schemas.auth import LoginRequest
 from app.utils.user import verify_password
 
+logger = logging.getLogger(__name__)
+
 
 # 도메인 예외 정의
 class EmptyFieldError(Exception):
@@ -33,8 +36,8 @@ class AuthService:
 
     async def authenticate_user(self, login_data: LoginRequest):
         # 사용자 조회
-        print("login_data: ", login_data)
-        print("login_data.email: ", login_data.email)
+        # 비밀번호가 들어 있으므로 login_data 전체를 남기지 않는다.
+        logger.debug("login attempt", extra={"email": login_data.email})
         if not login_data.email or not login_data.password:
             raise EmptyFieldError()
 
@@ -50,6 +53,8 @@ class AuthService:
             # 사용자 없음
             raise UserNotFoundError()
 
+        # bcrypt 검증 동안 커넥션을 잡고 있지 않도록 읽기 트랜잭션을 먼저 끝낸다. (user 는 이미 로드됨)
+        await self.db.close()
         password_ok = await verify_password(login_data.password, str(user.password))
         if not password_ok:
             # return None
@@ -58,7 +63,7 @@ class AuthService:
             # 비밀번호 불일치
             raise InvalidPasswordError()
 
-        print("user: ", user)
+        logger.debug("login succeeded", extra={"user_id": user.id})
         return user
 
 def get_auth_service(db: AsyncSession = Depends(get_db)):
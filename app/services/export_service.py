@@ -0,0 +1,84 @@
+from typing import AsyncIterator
+
+from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.core.database import get_db
+from app.models.qua import Question, Answer
+from app.models.user import User
+from app.schemas.export import QuestionExport, AnswerExport
+from app.utils.serialization import dump_json
+
+""" NDJSON 내보내기 (백업/오프라인 분석용)
+질문 LEFT JOIN 답변을 (question.id, answer.id) 순으로 서버 사이드 커서(AsyncSession.stream)로 읽으면서
+같은 질문의 행을 모아 한 줄로 내보낸다. ORM 그래프를 만들지 않고 컬럼만 읽으므로,
+메모리는 전체 행 수와 무관하게 한 배치 + 가장 큰 스레드 하나 크기로 일정하다.
+"""
+
+QuestionAuthor = aliased(User)
+AnswerAuthor = aliased(User)
+
+
+class ExportService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def _export_select(self):
+        return (
+            select(
+                Question.id,
+                Question.subject,
+                Question.content,
+                QuestionAuthor.username.label("author"),
+                Question.created_at,
+                Question.updated_at,
+                Question.last_activity_at,
+                Question.vote_count,
+                Question.answer_count,
+                Answer.id.label("answer_id"),
+                Answer.content.label("answer_content"),
+                AnswerAuthor.username.label("answer_author"),
+                Answer.created_at.label("answer_created_at"),
+                Answer.updated_at.label("answer_updated_at"),
+                Answer.vote_count.label("answer_vote_count"),
+            )
+            .select_from(Question)
+            .outerjoin(QuestionAuthor, QuestionAuthor.id == Question.author_id)
+            .outerjoin(Answer, Answer.question_id == Question.id)
+            .outerjoin(AnswerAuthor, AnswerAuthor.id == Answer.author_id)
+            .where(Question.deleted_at.is_(None))
+            .order_by(Question.id, Answer.id)
+        )
+
+    async def export_ndjson(self, batch_size: int = 1000) -> AsyncIterator[bytes]:
+        """질문 한 개당 한 줄(QuestionExport JSON)을 batch_size 행 단위로 묶어서 내보낸다."""
+        result = await self.db.stream(self._export_select().execution_options(yield_per=batch_size))
+        current: QuestionExport | None = None
+        async for partition in result.partitions():
+            lines = []
+            for row in partition:
+                if current is None or current.id != row.id:
+                    if current is not None:
+                        lines.append(dump_json(QuestionExport, current) + b"\n")
+                    # DB 에서 읽은 값이라 검증 없이 만든다. (직렬화만 한다)
+                    current = QuestionExport.model_construct(
+                        id=row.id, subject=row.subject, content=row.content, author=row.author,
+                        created_at=row.created_at, updated_at=row.updated_at, last_activity_at=row.last_activity_at,
+                        vote_count=row.vote_count, answer_count=row.answer_count, answers=[],
+                    )
+                if row.answer_id is not None:
+                    current.answers.append(AnswerExport.model_construct(
+                        id=row.answer_id, content=row.answer_content, author=row.answer_author,
+                        created_at=row.answer_created_at, updated_at=row.answer_updated_at,
+                        vote_count=row.answer_vote_count,
+                    ))
+            if lines:
+                yield b"".join(lines)
+        if current is not None:
+            yield dump_json(QuestionExport, current) + b"\n"
+
+
+def get_export_service(db: AsyncSession = Depends(get_db)) -> 'ExportService':
+    return ExportService(db)
@@ -0,0 +1,224 @@
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable
+
+from fastapi import Depends
+from pydantic import ValidationError
+from sqlalchemy import select, insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.core.hashing import hashing_pool, HashingPoolBusyError
+from app.models.qua import Question, Answer
+from app.models.search import QuestionSearchDocument
+from app.models.user import User
+from app.schemas.bulk_import import UserImport, QuestionImport, ImportReport, ImportLineError
+from app.services.search_service import build_document
+from app.utils.user import get_password_hash
+
+""" NDJSON 일괄 가져오기 (기존 게시판 이관용)
+create_question/create_answer 를 한 건씩 부르면 행마다 요청 + commit 이 든다. 여기서는
+- 줄마다 기존 입력 스키마(UserIn/QuestionIn/AnswerIn 상속)로 검증하고, 실패한 줄은 기록만 하고 건너뛴다.
+- batch_size 줄씩 모아서 users -> questions -> answers -> 검색 문서 순으로 multi-row INSERT(executemany) 후 한 번 commit
+- 비밀번호는 배치 단위로 해싱 프로세스 풀에 동시에 넣는다. (DB 커넥션을 잡기 전에)
+- commit 할 때마다 체크포인트(committed_lines)를 알려준다. 중단되면 skip_lines=committed_lines 로 이어서 실행한다.
+형식은 app/schemas/bulk_import.py 참고
+"""
+
+logger = logging.getLogger(__name__)
+
+MAX_REPORTED_ERRORS = 100
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """바이트 청크 스트림(요청 본문 등)을 줄 단위로 나눈다."""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+
+def _as_utc(value: datetime | None, default: datetime) -> datetime:
+    # 시간대가 없는 값(내보내기/원본 DB 에 따라 다름)은 UTC 로 본다.
+    if value is None:
+        return default
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+async def _hash_password(password: str) -> str:
+    # 로그인 요청과 풀을 같이 쓰므로, 대기열이 가득 차면 거절 대신 잠깐 기다렸다가 다시 넣는다.
+    while True:
+        try:
+            return await get_password_hash(password)
+        except HashingPoolBusyError:
+            await asyncio.sleep(0.05)
+
+
+async def hash_passwords(passwords: list[str]) -> list[str]:
+    """해싱 풀 크기만큼씩 동시에 해싱한다. (풀이 없으면 스레드로, 그래도 bcrypt 는 GIL 을 놓으므로 병렬)"""
+    window = max(hashing_pool.size, 4)
+    hashes = []
+    for i in range(0, len(passwords), window):
+        hashes += await asyncio.gather(*(_hash_password(p) for p in passwords[i:i + window]))
+    return hashes
+
+
+class ImportService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def import_ndjson(self, lines: AsyncIterable[bytes | str], batch_size: int = 1000, skip_lines: int = 0,
+                            on_checkpoint: Callable[[ImportReport], Awaitable[None]] | None = None) -> ImportReport:
+        report = ImportReport()
+        start = time.perf_counter()
+        users: list[UserImport] = []
+        questions: list[QuestionImport] = []
+        pending = 0 # 현재 배치에 모인 줄 수
+
+        async def flush():
+            nonlocal users, questions, pending
+            if pending:
+                await self._insert_batch(users, questions, report)
+                report.committed_lines = report.lines
+                self._update_rate(report, start)
+                logger.info("import batch committed", extra={
+                    "committed_lines": report.committed_lines, "rows_per_sec": report.rows_per_sec})
+                if on_checkpoint is not None:
+                    await on_checkpoint(report)
+            users, questions, pending = [], [], 0
+
+        async for raw in lines:
+            report.lines += 1
+            if report.lines <= skip_lines:
+                report.committed_lines = report.lines
+                continue
+            pending += 1
+            try:
+                item = self._parse_line(raw)
+            except (ValueError, ValidationError) as e:
+                self._record_error(report, report.lines, e)
+            else:
+                if isinstance(item, UserImport):
+                    users.append(item)
+                elif item is not None:
+                    questions.append(item)
+
+            if pending >= batch_size:
+                try:
+                    await flush()
+                except DBAPIError as e:
+                    await self._abort(report, e)
+                    break
+        else:
+            try:
+                await flush()
+            except DBAPIError as e:
+                await self._abort(report, e)
+
+        self._update_rate(report, start)
+        return report
+
+    @staticmethod
+    def _parse_line(raw: bytes | str) -> UserImport | QuestionImport | None:
+        if not raw.strip():
+            return None # 빈 줄
+        data = json.loads(raw)
+        if not isinstance(data, dict):
+            raise ValueError("JSON 객체가 아닙니다.")
+        line_type = data.pop("type", "question")
+        if line_type == "user":
+            return UserImport.model_validate(data)
+        if line_type == "question":
+            return QuestionImport.model_validate(data)
+        raise ValueError(f"알 수 없는 type: {line_type}")
+
+    @staticmethod
+    def _record_error(report: ImportReport, line: int, error: Exception):
+        report.invalid += 1
+        if len(report.errors) < MAX_REPORTED_ERRORS:
+            if isinstance(error, ValidationError):
+                detail = "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in error.errors())
+            else:
+                detail = str(error)
+            report.errors.append(ImportLineError(line=line, detail=detail))
+
+    async def _abort(self, report: ImportReport, error: DBAPIError):
+        await self.db.rollback()
+        report.aborted = str(error.orig or error)
+        logger.warning("import aborted", extra={"committed_lines": report.committed_lines})
+
+    @staticmethod
+    def _update_rate(report: ImportReport, start: float):
+        report.elapsed = round(time.perf_counter() - start, 3)
+        rows = report.users + report.questions + report.answers
+        report.rows_per_sec = round(rows / report.elapsed, 1) if report.elapsed else 0.0
+
+    async def _insert_batch(self, users: list[UserImport], questions: list[QuestionImport], report: ImportReport):
+        # 1) 해싱은 커넥션을 잡기 전에 끝낸다. (이전 배치의 commit 으로 커넥션은 풀에 돌아가 있다)
+        hashes = await hash_passwords([user.password1 for user in users])
+        now = datetime.now(timezone.utc)
+
+        if users:
+            # 이미 있는 username/email 은 건너뛴다. (재실행 시에도 안전)
+            result = await self.db.execute(
+                insert(User.__table__).prefix_with("IGNORE", dialect="mysql").prefix_with("OR IGNORE", dialect="sqlite"),
+                [dict(username=user.username, email=str(user.email), password=hashed, created_at=now, updated_at=now)
+                 for user, hashed in zip(users, hashes)],
+            )
+            report.users += result.rowcount
+            report.skipped_users += len(users) - result.rowcount
+
+        if not questions:
+            await self.db.commit()
+            return
+
+        # 2) 작성자 username -> id 를 배치당 한 번에 찾는다.
+        usernames = {q.author for q in questions if q.author}
+        usernames |= {a.author for q in questions for a in q.answers if a.author}
+        author_ids = {}
+        if usernames:
+            author_ids = dict((await self.db.execute(
+                select(User.username, User.id).where(User.username.in_(usernames))
+            )).all())
+
+        question_rows, answer_rows, document_rows = [], [], []
+        for question in questions:
+            created_at = _as_utc(question.created_at, now)
+            last_activity_at = max([created_at] + [_as_utc(a.created_at, now) for a in question.answers])
+            question_rows.append(dict(
+                id=question.id, subject=question.subject, content=question.content,
+                author_id=author_ids.get(question.author), created_at=created_at, updated_at=created_at,
+                last_activity_at=last_activity_at, answer_count=len(question.answers),
+            ))
+            for answer in question.answers:
+                answer_created_at = _as_utc(answer.created_at, now)
+                answer_rows.append(dict(
+                    question_id=question.id, content=answer.content, author_id=author_ids.get(answer.author),
+                    created_at=answer_created_at, updated_at=answer_created_at,
+                ))
+            document_rows.append(dict(
+                question_id=question.id, subject=question.subject,
+                document=build_document(question.subject, question.content, question.author,
+                                        [(a.content, a.author) for a in question.answers]),
+            ))
+
+        # 3) multi-row INSERT (Core 테이블로 ORM 객체를 만들지 않는다). 질문 id 는 원본 값이므로 답변이 바로 참조할 수 있다.
+        await self.db.execute(insert(Question.__table__), question_rows)
+        if answer_rows:
+            await self.db.execute(insert(Answer.__table__), answer_rows)
+        await self.db.execute(insert(QuestionSearchDocument.__table__), document_rows)
+        await self.db.commit()
+        report.questions += len(question_rows)
+        report.answers += len(answer_rows)
+
+
+def get_import_service(db: AsyncSession = Depends(get_db)) -> 'ImportService':
+    return ImportService(db)
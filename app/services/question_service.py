@@ -1,29 +1,115 @@
+from datetime import datetime, timezone
+
 from fastapi import Depends
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, func, and_, or_, update, literal, delete
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import aliased
+from sqlalchemy.orm import noload
 
+from app.core.config import get_config
 from app.core.database import get_db
+from app.core.pubsub import pubsub
 from app.models.qua import Question, Answer
-from app.models.user import User, question_voter
-from app.schemas.question import QuestionIn
+from app.models.user import User, question_voter, answer_voter
+from app.schemas.auth import CurrentUser
+from app.schemas.question import QuestionIn, QuestionSummary, QuestionOut, QuestionUpdateOut, QuestionSort
+from app.schemas.user import UserOrm
+from app.schemas.vote import VoteOut
+from app.services.search_service import SearchService, enqueue_reindex
+from app.utils.etag import make_etag
+from app.utils.pagination import encode_cursor, decode_cursor, parse_cursor_datetime, InvalidCursorError
+
+config = get_config()
+
+# 목록 정렬별 키 컬럼. 모두 내림차순 + id 내림차순이며 (키, id) 복합 인덱스를 역순으로 읽는다.
+QUESTION_SORT_KEYS = {
+    "recent": Question.created_at,
+    "votes": Question.vote_count,
+    "activity": Question.last_activity_at,
+}
+
+
+def question_topic(question_id: int) -> str:
+    """질문 상세 실시간 이벤트(SSE) 채널 이름. 이벤트는 모두 commit 뒤에 발행한다."""
+    return f"question:{question_id}"
+
+
+def question_cursor(question, sort: QuestionSort = "recent") -> str:
+    """목록의 한 행(Question 또는 QuestionSummary)에서 다음 페이지 커서를 만든다."""
+    return encode_cursor(getattr(question, QUESTION_SORT_KEYS[sort].key), question.id)
+
+# 도메인 예외 정의
+class VersionConflictError(Exception):
+    """요청의 version 이 현재 version 과 다름 (그 사이 다른 수정이 있었음)"""
+
+    def __init__(self, current_version: int):
+        super().__init__(current_version)
+        self.current_version = current_version
+
+
+async def check_write_miss(db: AsyncSession, model, entity_id: int, user: CurrentUser, version: int | None):
+    """조건부 UPDATE/DELETE 가 한 행도 바꾸지 못했을 때만 원인을 가볍게 확인한다. (그래프는 읽지 않음)
+    반환: None(대상 없음), False(작성자 아님). version 불일치면 VersionConflictError"""
+    query = select(model.author_id, model.version).where(model.id == entity_id)
+    if model is Question:
+        query = query.where(Question.deleted_at.is_(None))
+    else:
+        # 답변: 질문이 소프트 삭제됐으면 없는 것으로 본다.
+        query = query.where(
+            select(Question.id).where(Question.id == model.question_id, Question.deleted_at.is_(None)).exists()
+        )
+    row = (await db.execute(query)).one_or_none()
+    if row is None:
+        return None
+    if row.author_id != user.id:
+        return False
+    raise VersionConflictError(row.version)
+
+
+async def execute_versioned_update(db: AsyncSession, stmt, model, entity_id: int) -> int | None:
+    """version=version+1 을 포함한 조건부 UPDATE 를 실행하고 새 version 을 돌려준다. 바뀐 행이 없으면 None
+    RETURNING 을 지원하면(SQLite/MariaDB 등) 한 문장으로, 아니면(MySQL) 같은 트랜잭션에서 PK 로 다시 읽는다.
+    (UPDATE 가 행 잠금을 잡고 있으므로 commit 전까지 다른 수정이 끼어들 수 없다)"""
+    if db.get_bind().dialect.update_returning:
+        return (await db.execute(stmt.returning(model.version))).scalar_one_or_none()
+    result = await db.execute(stmt)
+    if result.rowcount != 1:
+        return None
+    return await db.scalar(select(model.version).where(model.id == entity_id))
 
 
 class QuestionService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def create_question(self, question_in: QuestionIn, user: User):
-        create_question = Question(**question_in.model_dump())
+    async def create_question(self, question_in: QuestionIn, user: CurrentUser) -> QuestionOut:
+        """INSERT 후 refresh(관계 그래프 selectin 재조회) 없이, 알고 있는 값으로 응답을 만든다.
+        (created_at/updated_at/카운터/version 은 파이썬 쪽 default 라 flush 후 객체에 채워져 있다)"""
+        create_question = Question(**question_in.model_dump(exclude={"version"}))
         create_question.author_id = user.id
 
         self.db.add(create_question)
+        await self.db.flush()
+        SearchService(self.db).add_question(create_question.id, create_question.subject, create_question.content,
+                                            user.username)
         await self.db.commit()
-        await self.db.refresh(create_question)
 
-        return create_question
+        return QuestionOut(
+            id=create_question.id,
+            subject=create_question.subject,
+            content=create_question.content,
+            created_at=create_question.created_at,
+            updated_at=create_question.updated_at,
+            author=UserOrm(id=user.id, username=user.username, email=user.email),
+            answers_all=[],
+            voter=[],
+            vote_count=0,
+            answer_count=0,
+            version=create_question.version,
+            last_activity_at=create_question.last_activity_at,
+        )
 
-    async def get_questions(self, skip: int = 0, limit: int = 10, keyword: str | None = None):
+    async def get_questions(self, skip: int = 0, limit: int = 10, keyword: str | None = None, with_total: bool = True,
+                            summary: bool = False, sort: QuestionSort = "recent"):
         '''
         # 1) 전체 건수
         total = await self.db.scalar(
@@ -42,123 +128,294 @@ class QuestionService:
         question_list = result.scalars().all()
         '''
 
-        # 별칭: 답변 작성자
-        _AnswerAuthor = aliased(User)
-
-        # 공통: FROM Question
-        base_select = select(Question)
-        count_select = select(func.count(func.distinct(Question.id))).select_from(Question)
-
-        if keyword:
-            pattern = f"%{keyword.strip()}%"
-
-            # 질문 작성자 / 답변 / 답변 작성자 조인
-            base_select = (
-                base_select
-                .outerjoin(User, User.id == Question.author_id)
-                .outerjoin(Answer, Answer.question_id == Question.id)
-                .outerjoin(_AnswerAuthor, Answer.author.of_type(_AnswerAuthor))
-                .where(
-                    or_(
-                        Question.subject.ilike(pattern),
-                        Question.content.ilike(pattern),
-                        User.username.ilike(pattern),
-                        Answer.content.ilike(pattern),
-                        _AnswerAuthor.username.ilike(pattern),
-                    )
-                )
-            )
+        # 1) 전체 건수 (검색 조건 반영), with_total=False 면 count 쿼리 생략
+        total = await self.count_questions(keyword) if with_total else None
 
-            count_select = (
-                count_select
-                .outerjoin(User, User.id == Question.author_id)
-                .outerjoin(Answer, Answer.question_id == Question.id)
-                .outerjoin(_AnswerAuthor, Answer.author.of_type(_AnswerAuthor))
-                .where(
-                    or_(
-                        Question.subject.ilike(pattern),
-                        Question.content.ilike(pattern),
-                        User.username.ilike(pattern),
-                        Answer.content.ilike(pattern),
-                        _AnswerAuthor.username.ilike(pattern),
-                    )
-                )
-            )
+        # 2) 목록: sort 순 + 페이징
+        key = QUESTION_SORT_KEYS[sort]
+        list_stmt = (
+            self._apply_keyword(self._list_select(summary), keyword)
+            .order_by(key.desc(), Question.id.desc())
+            .offset(skip)
+            .limit(limit)
+        )
 
-        # 1) 전체 건수 (검색 조건 반영)
+        question_list = await self._fetch_list(list_stmt, summary)
+
+        return total, question_list  # (전체 건수, 페이징 적용된 질문 목록)
+
+    async def count_questions(self, keyword: str | None = None) -> int:
+        count_select = self._apply_keyword(
+            select(func.count(Question.id)).select_from(Question).where(Question.deleted_at.is_(None)), keyword
+        )
         total = await self.db.scalar(count_select)
-        total = total or 0
+        return total or 0
+
+    async def get_questions_by_cursor(self, cursor: str | None = None, limit: int = 10, keyword: str | None = None,
+                                      summary: bool = False, sort: QuestionSort = "recent"):
+        """키셋(커서) 페이지네이션: (정렬 키, id) 기준으로 이전 페이지의 마지막 행 다음부터 읽는다.
+        정렬 키는 sort 에 따라 created_at / vote_count / last_activity_at (QUESTION_SORT_KEYS)
+        OFFSET 처럼 건너뛴 행을 스캔하지 않으므로 페이지가 깊어져도 비용이 일정하다.
+        cursor가 None(또는 빈 문자열)이면 첫 페이지. 다음 페이지가 없으면 next_cursor는 None.
+        """
+        key = QUESTION_SORT_KEYS[sort]
+        list_stmt = self._apply_keyword(self._list_select(summary), keyword)
+        if cursor:
+            values = decode_cursor(cursor, 2)
+            key_value = values[0] if key is Question.vote_count else parse_cursor_datetime(values[0])
+            question_id = values[1]
+            if not isinstance(key_value, (int, datetime)) or not isinstance(question_id, int):
+                raise InvalidCursorError(cursor)
+            list_stmt = list_stmt.where(
+                or_(
+                    key < key_value,
+                    and_(key == key_value, Question.id < question_id),
+                )
+            )
 
-        # 2) 목록: DISTINCT로 중복 제거 + 최신순 + 페이징
+        # 한 건 더 읽어서 다음 페이지 존재 여부를 판단한다. (별도 count 쿼리 불필요)
         list_stmt = (
-            base_select
-            .distinct(Question.id)
-            .order_by(Question.created_at.desc())
-            .offset(skip)
-            .limit(limit)
+            list_stmt
+            .order_by(key.desc(), Question.id.desc())
+            .limit(limit + 1)
+        )
+        question_list = await self._fetch_list(list_stmt, summary)
+
+        next_cursor = None
+        if len(question_list) > limit:
+            question_list = question_list[:limit]
+            next_cursor = question_cursor(question_list[-1], sort)
+        return question_list, next_cursor
+
+    @staticmethod
+    def _list_select(summary: bool):
+        if not summary:
+            return select(Question).where(Question.deleted_at.is_(None))
+        # 목록용 요약(QuestionSummary): 답변/추천 목록을 통째로 eager-load 하지 않고,
+        # 비정규화 카운터 컬럼(answer_count, vote_count)을 그대로 읽는다.
+        return (
+            select(
+                Question.id,
+                Question.subject,
+                Question.created_at,
+                User.username.label("author_name"),
+                Question.answer_count,
+                Question.vote_count,
+                Question.last_activity_at,
+            )
+            .select_from(Question)
+            .outerjoin(User, User.id == Question.author_id)
+            .where(Question.deleted_at.is_(None))
         )
 
+    async def _fetch_list(self, list_stmt, summary: bool) -> list:
         result = await self.db.execute(list_stmt)
-        question_list = result.scalars().all()
+        if summary:
+            return [QuestionSummary.model_validate(row) for row in result.all()]
+        return list(result.scalars().all())
 
-        return total, question_list  # (전체 건수, 페이징 적용된 질문 목록)
+    def _apply_keyword(self, stmt, keyword: str | None):
+        if not keyword or not keyword.strip():
+            return stmt
+        # 질문/작성자/답변/답변 작성자를 outer join 하고 ILIKE 하던 방식 대신,
+        # 질문별로 유지되는 검색 문서(FULLTEXT 인덱스)에서 일치하는 question_id 만 골라낸다.
+        return stmt.where(Question.id.in_(SearchService(self.db).matching_ids(keyword)))
 
-    async def get_question(self, question_id: int):
-        query = (select(Question).where(Question.id == question_id))
+    async def get_question(self, question_id: int, with_answers: bool = True):
+        """with_answers=False 면 answers_all(답변 전체와 그 작성자/추천자)을 로드하지 않는다. (상세 answers=page)"""
+        query = (select(Question).where(Question.id == question_id, Question.deleted_at.is_(None)))
+        if not with_answers:
+            query = query.options(noload(Question.answers_all))
         result = await self.db.execute(query)
         question = result.scalar_one_or_none()
         return question
 
-    async def update_question(self, question_id: int, question_in: QuestionIn, user: User):
-        question = await self.get_question(question_id)
-        if question is None:
+    async def get_question_etag(self, question_id: int) -> str | None:
+        """질문 상세 응답의 ETag. 질문/답변의 updated_at, 카운터, 최신 답변 id 만 집계하는 한 번의 쿼리로 만든다.
+        질문이 없으면 None"""
+        query = (
+            select(
+                Question.updated_at,
+                Question.vote_count,
+                Question.answer_count,
+                func.max(Answer.id),
+                func.max(Answer.updated_at),
+                func.sum(Answer.vote_count),
+            )
+            .outerjoin(Answer, Answer.question_id == Question.id)
+            .where(Question.id == question_id, Question.deleted_at.is_(None))
+            .group_by(Question.id, Question.updated_at, Question.vote_count, Question.answer_count)
+        )
+        row = (await self.db.execute(query)).one_or_none()
+        if row is None:
             return None
-        if question.author_id != user.id:
-            return False
-        question.subject = question_in.subject
-        question.content = question_in.content
+        return make_etag("question", question_id, *row)
+
+    async def update_question(self, question_id: int, question_in: QuestionIn, user: CurrentUser):
+        """UPDATE ... WHERE id=? AND author_id=? [AND version=?] 한 문장으로 수정하고 rowcount 로 판단한다.
+        반환: QuestionUpdateOut, None(질문 없음), False(작성자 아님). version 불일치면 VersionConflictError"""
+        now = datetime.now(timezone.utc)
+        stmt = (
+            update(Question)
+            .where(Question.id == question_id, Question.author_id == user.id, Question.deleted_at.is_(None))
+            .values(subject=question_in.subject, content=question_in.content, updated_at=now,
+                    version=Question.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        if question_in.version is not None:
+            stmt = stmt.where(Question.version == question_in.version)
+        version = await execute_versioned_update(self.db, stmt, Question, question_id)
+        if version is None:
+            await self.db.rollback()
+            return await check_write_miss(self.db, Question, question_id, user, question_in.version)
+
         await self.db.commit()
-        await self.db.refresh(question)
-        return question
+        # 검색 문서 재생성(답변 전체를 다시 읽음)은 응답 뒤 후처리 잡으로
+        enqueue_reindex(question_id)
+        updated = QuestionUpdateOut(
+            id=question_id,
+            subject=question_in.subject,
+            content=question_in.content,
+            updated_at=now,
+            version=version,
+        )
+        pubsub.publish(question_topic(question_id), "question_updated", updated)
+        return updated
 
-    async def delete_question(self, question_id: int, user: User):
-        question = await self.get_question(question_id)
-        if question is None:
+    async def delete_question(self, question_id: int, user: CurrentUser):
+        """작성자 확인은 (author_id, answer_count) 만 읽고, 삭제는 DELETE 한 문장으로 끝낸다.
+        답변/추천/검색 문서는 FK 의 ON DELETE CASCADE 로 DB 가 함께 지운다.
+        답변이 QUESTION_SOFT_DELETE_THRESHOLD 개 이상이면 한 트랜잭션에서 지우지 않고 deleted_at 만 기록한다.
+        (실제 삭제는 purge_deleted_questions 가 나눠서 처리)
+        반환: True, None(질문 없음), False(작성자 아님)"""
+        row = (await self.db.execute(
+            select(Question.author_id, Question.answer_count)
+            .where(Question.id == question_id, Question.deleted_at.is_(None))
+        )).one_or_none()
+        if row is None:
             return None
-        if question.author_id != user.id:
+        if row.author_id != user.id:
             return False
-        await self.db.delete(question)
+
+        threshold = config.QUESTION_SOFT_DELETE_THRESHOLD
+        if threshold and row.answer_count >= threshold:
+            result = await self.db.execute(
+                update(Question)
+                .where(Question.id == question_id, Question.author_id == user.id, Question.deleted_at.is_(None))
+                .values(deleted_at=datetime.now(timezone.utc), updated_at=Question.updated_at)
+                .execution_options(synchronize_session=False)
+            )
+            # 검색에서는 바로 빠져야 하므로 검색 문서만 먼저 지운다.
+            await SearchService(self.db).remove_question(question_id)
+        else:
+            result = await self.db.execute(
+                delete(Question).where(Question.id == question_id, Question.author_id == user.id)
+            )
+        if result.rowcount != 1:
+            await self.db.rollback()
+            return None
         await self.db.commit()
+        pubsub.publish(question_topic(question_id), "question_deleted", {"id": question_id})
         return True
 
-    async def vote_question(self, question_id: int, user: User):
-        question = await self.get_question(question_id)
-        if question is None:
-            return None
-        if question.author_id == user.id:
-            return False
-        # 2) 이미 투표했는지 확인
-        query = select(question_voter.c.user_id).where(
-                and_(question_voter.c.question_id == question_id,
-                question_voter.c.user_id == user.id)
+    async def purge_deleted_questions(self, batch_size: int = 1000) -> int:
+        """소프트 삭제된 질문을 실제로 지운다. 답변은 batch_size 개씩 나눠 지우고 배치마다 commit 해서
+        한 트랜잭션이 오래 잠금을 잡지 않게 한다. (답변 추천은 CASCADE) 지운 질문 수 반환"""
+        purged = 0
+        while True:
+            question_id = await self.db.scalar(
+                select(Question.id)
+                .where(Question.deleted_at.is_not(None))
+                .order_by(Question.deleted_at, Question.id)
+                .limit(1)
             )
-        result = await self.db.execute(query)
-        exists = result.scalar_one_or_none()
-        if exists is not None:
-            # 이미 투표했다면 아무 것도 하지 않음(또는 에러 반환)
-            return None
+            if question_id is None:
+                return purged
+            while True:
+                # MySQL 은 DELETE ... IN (서브쿼리 LIMIT) 을 지원하지 않으므로 id 를 먼저 읽는다.
+                answer_ids = (await self.db.scalars(
+                    select(Answer.id).where(Answer.question_id == question_id).order_by(Answer.id).limit(batch_size)
+                )).all()
+                if not answer_ids:
+                    break
+                await self.db.execute(
+                    delete(Answer).where(Answer.id.in_(answer_ids)).execution_options(synchronize_session=False)
+                )
+                await self.db.commit()
+            await self.db.execute(delete(Question).where(Question.id == question_id))
+            await self.db.commit()
+            purged += 1
 
-        # 3) 직접 연결 테이블에 insert (관계 접근 없음 -> MissingGreenlet 회피)
-        await self.db.execute(
-            question_voter.insert().values(
-                question_id=question_id,
-                user_id=user.id,
+    async def vote_question(self, question_id: int, user: CurrentUser):
+        """추천: 조건부 INSERT ... SELECT 한 문장으로 처리한다.
+        - 질문이 존재하고 작성자가 아닐 때만 insert (작성자 검사도 SELECT 의 WHERE 에서)
+        - 이미 추천했으면 IGNORE 로 무시 -> 동시 더블클릭에도 IntegrityError 없이 멱등
+        반환: VoteOut(recorded=추천이 기록됐는지, 현재 추천 수), None(질문 없음)
+        """
+        source = (
+            select(literal(user.id), Question.id)
+            .where(Question.id == question_id, Question.deleted_at.is_(None),
+                   or_(Question.author_id.is_(None), Question.author_id != user.id))
+        )
+        result = await self.db.execute(
+            question_voter.insert()
+            .from_select(["user_id", "question_id"], source)
+            .prefix_with("IGNORE", dialect="mysql")
+            .prefix_with("OR IGNORE", dialect="sqlite")
+        )
+        if result.rowcount != 1:
+            await self.db.rollback()
+            # 기록되지 않은 경우에만 존재 여부(와 현재 추천 수)를 가볍게 확인한다.
+            vote_count = await self.db.scalar(
+                select(Question.vote_count).where(Question.id == question_id, Question.deleted_at.is_(None))
             )
+            return None if vote_count is None else VoteOut(recorded=False, vote_count=vote_count)
+
+        # 비정규화 카운터 증가 (같은 트랜잭션), 추천은 수정이 아니므로 updated_at 은 유지
+        await self.db.execute(
+            update(Question)
+            .where(Question.id == question_id)
+            .values(vote_count=Question.vote_count + 1, updated_at=Question.updated_at)
         )
+        vote_count = await self.db.scalar(select(Question.vote_count).where(Question.id == question_id))
+        await self.db.commit()
+        pubsub.publish(question_topic(question_id), "vote_changed",
+                       {"target": "question", "id": question_id, "vote_count": vote_count})
+        return VoteOut(recorded=True, vote_count=vote_count)
 
+    async def recount_counters(self):
+        """vote_count / answer_count 드리프트 복구: 연관 테이블에서 다시 집계해 덮어쓴다. (manage.py recount)"""
+        question_votes = (
+            select(func.count())
+            .select_from(question_voter)
+            .where(question_voter.c.question_id == Question.id)
+            .scalar_subquery()
+        )
+        question_answers = (
+            select(func.count(Answer.id))
+            .where(Answer.question_id == Question.id)
+            .scalar_subquery()
+        )
+        answer_votes = (
+            select(func.count())
+            .select_from(answer_voter)
+            .where(answer_voter.c.answer_id == Answer.id)
+            .scalar_subquery()
+        )
+        questions = await self.db.execute(
+            update(Question)
+            .where(or_(Question.vote_count != question_votes, Question.answer_count != question_answers))
+            .values(vote_count=question_votes, answer_count=question_answers, updated_at=Question.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        answers = await self.db.execute(
+            update(Answer)
+            .where(Answer.vote_count != answer_votes)
+            .values(vote_count=answer_votes, updated_at=Answer.updated_at)
+            .execution_options(synchronize_session=False)
+        )
         await self.db.commit()
-        await self.db.refresh(question)
-        return True
+        return questions.rowcount, answers.rowcount
 
 def get_question_service(db: AsyncSession = Depends(get_db)) -> 'QuestionService':
     return QuestionService(db)
\ No newline at end of file
@@ -0,0 +1,207 @@
+import html
+import re
+from datetime import datetime, timezone
+
+from fastapi import Depends
+from sqlalchemy import select, func, literal, delete, insert
+from sqlalchemy.dialects.mysql import match, insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db, AsyncSessionLocal, use_primary
+from app.core.jobs import jobs
+from app.models.qua import Question, Answer
+from app.models.search import QuestionSearchDocument
+from app.models.user import User
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+
+SNIPPET_RADIUS = 60
+
+
+def html_to_text(value: str | None) -> str:
+    """QuillEditor 에서 올라온 HTML 본문을 검색용 평문으로 변환"""
+    if not value:
+        return ""
+    text = html.unescape(_TAG_RE.sub(" ", value))
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def make_snippet(document: str, keyword: str, radius: int = SNIPPET_RADIUS) -> str:
+    """문서에서 검색어가 처음 등장하는 위치 주변을 잘라낸다. 못 찾으면 문서 앞부분."""
+    lowered = document.lower()
+    positions = [lowered.find(term) for term in keyword.lower().split() if term]
+    positions = [p for p in positions if p >= 0]
+    if not positions:
+        return document[:radius * 2] + ("…" if len(document) > radius * 2 else "")
+    pos = min(positions)
+    start = max(pos - radius, 0)
+    end = min(pos + radius, len(document))
+    return ("…" if start > 0 else "") + document[start:end] + ("…" if end < len(document) else "")
+
+
+def build_document(subject: str, content: str | None, username: str | None, answers=()) -> str:
+    """검색 문서 본문: 제목, 본문 평문, 작성자, 답변마다 (본문 평문, 작성자). answers 는 (content, username) 목록"""
+    parts = [subject, html_to_text(content), username or ""]
+    for answer_content, answer_username in answers:
+        parts.append(html_to_text(answer_content))
+        parts.append(answer_username or "")
+    return " ".join(p for p in parts if p)
+
+
+async def reindex_question(question_id: int):
+    """후처리 잡: 자기 세션으로 질문의 검색 문서를 다시 만든다. (실행 시점의 최신 내용 기준)"""
+    async with AsyncSessionLocal() as session:
+        use_primary(session) # 방금 commit 된 내용을 읽어야 하므로 복제본이 아니라 primary 에서
+        try:
+            await SearchService(session).index_question(question_id)
+            await session.commit()
+        except IntegrityError:
+            # 읽은 뒤 upsert 전에 질문이 삭제됨(FK 위반): 문서는 CASCADE 로 이미 지워졌으므로 재시도할 일이 없다.
+            await session.rollback()
+            exists = await session.scalar(
+                select(Question.id).where(Question.id == question_id, Question.deleted_at.is_(None))
+            )
+            if exists is not None:
+                raise
+
+
+def enqueue_reindex(question_id: int) -> bool:
+    """commit 뒤에 호출한다. 같은 질문의 재색인이 이미 대기 중이면 한 번만 실행된다."""
+    return jobs.enqueue("search.reindex_question", reindex_question, question_id,
+                        key=f"search.reindex_question:{question_id}")
+
+
+class SearchService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def _use_fulltext(self) -> bool:
+        # MySQL 이외(로컬 SQLite 등)에서는 검색 문서 테이블 하나에 대한 LIKE 로 대체한다.
+        return self.db.get_bind().dialect.name == "mysql"
+
+    async def index_question(self, question_id: int):
+        """질문의 검색 문서를 다시 만든다. 호출한 쪽의 트랜잭션 안에서 실행되며 commit 은 호출한 쪽에서 한다."""
+        query = (
+            select(Question.subject, Question.content, User.username)
+            .outerjoin(User, User.id == Question.author_id)
+            .where(Question.id == question_id, Question.deleted_at.is_(None))
+        )
+        row = (await self.db.execute(query)).one_or_none()
+        if row is None:
+            await self.remove_question(question_id)
+            return
+
+        answer_query = (
+            select(Answer.content, User.username)
+            .outerjoin(User, User.id == Answer.author_id)
+            .where(Answer.question_id == question_id)
+            .order_by(Answer.id)
+        )
+        answers = (await self.db.execute(answer_query)).all()
+
+        document = build_document(row.subject, row.content, row.username, answers)
+        await self._upsert_document(question_id, row.subject, document)
+
+    async def _upsert_document(self, question_id: int, subject: str, document: str):
+        """INSERT 한 문장으로 있으면 갱신한다. (merge 의 SELECT -> UPDATE 는 동시 삭제와 경합해서 StaleDataError 가 난다)"""
+        table = QuestionSearchDocument.__table__
+        values = dict(question_id=question_id, subject=subject, document=document, updated_at=datetime.now(timezone.utc))
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "mysql":
+            stmt = mysql_insert(table).values(**values)
+            stmt = stmt.on_duplicate_key_update(
+                subject=stmt.inserted.subject, document=stmt.inserted.document, updated_at=stmt.inserted.updated_at)
+        elif dialect == "sqlite":
+            stmt = sqlite_insert(table).values(**values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.question_id],
+                set_=dict(subject=stmt.excluded.subject, document=stmt.excluded.document, updated_at=stmt.excluded.updated_at))
+        else:
+            await self.remove_question(question_id)
+            stmt = insert(table).values(**values)
+        await self.db.execute(stmt)
+
+    async def remove_question(self, question_id: int):
+        await self.db.execute(delete(QuestionSearchDocument).where(QuestionSearchDocument.question_id == question_id))
+
+    def add_question(self, question_id: int, subject: str, content: str, username: str | None):
+        """새 질문의 검색 문서. 답변이 없으므로 다시 읽지 않고 INSERT 한 문장으로 만든다."""
+        document = build_document(subject, content, username)
+        self.db.add(QuestionSearchDocument(question_id=question_id, subject=subject, document=document))
+
+    async def reindex_all(self, batch_size: int = 500) -> int:
+        """검색 문서 전체 재생성 (최초 도입/드리프트 복구용, manage.py reindex-search)"""
+        count = 0
+        last_id = 0
+        while True:
+            ids = (await self.db.scalars(
+                select(Question.id).where(Question.id > last_id, Question.deleted_at.is_(None)).order_by(Question.id).limit(batch_size)
+            )).all()
+            if not ids:
+                break
+            for question_id in ids:
+                await self.index_question(question_id)
+            await self.db.commit()
+            count += len(ids)
+            last_id = ids[-1]
+        return count
+
+    def matching_ids(self, keyword: str):
+        """keyword 와 일치하는 question_id 서브쿼리 (목록 API 의 keyword 필터용)"""
+        keyword = keyword.strip()
+        if self._use_fulltext():
+            condition = match(QuestionSearchDocument.document, against=keyword).in_natural_language_mode()
+        else:
+            condition = QuestionSearchDocument.document.ilike(f"%{keyword}%")
+        return select(QuestionSearchDocument.question_id).where(condition)
+
+    async def search(self, keyword: str, skip: int = 0, limit: int = 10):
+        """관련도 순 검색. (전체 건수, [SearchHit 형태의 dict]) 반환"""
+        keyword = keyword.strip()
+        if self._use_fulltext():
+            doc_score = match(QuestionSearchDocument.document, against=keyword).in_natural_language_mode()
+            subject_score = match(QuestionSearchDocument.subject, against=keyword).in_natural_language_mode()
+            # 제목 일치에 가중치를 더 준다.
+            score = (doc_score + subject_score * 2).label("score")
+            condition = doc_score > 0
+            order_by = (score.desc(), Question.id.desc())
+        else:
+            score = literal(1.0).label("score")
+            condition = QuestionSearchDocument.document.ilike(f"%{keyword}%")
+            order_by = (Question.created_at.desc(), Question.id.desc())
+
+        total = await self.db.scalar(
+            select(func.count()).select_from(QuestionSearchDocument).where(condition)
+        ) or 0
+
+        query = (
+            select(Question.id, Question.subject, Question.created_at, User.username,
+                   QuestionSearchDocument.document, score)
+            .select_from(QuestionSearchDocument)
+            .join(Question, Question.id == QuestionSearchDocument.question_id)
+            .outerjoin(User, User.id == Question.author_id)
+            .where(condition)
+            .order_by(*order_by)
+            .offset(skip)
+            .limit(limit)
+        )
+        rows = (await self.db.execute(query)).all()
+        hits = [
+            {
+                "id": row.id,
+                "subject": row.subject,
+                "author_name": row.username,
+                "created_at": row.created_at,
+                "score": float(row.score or 0),
+                "snippet": make_snippet(row.document, keyword),
+            }
+            for row in rows
+        ]
+        return total, hits
+
+
+def get_search_service(db: AsyncSession = Depends(get_db)) -> 'SearchService':
+    return SearchService(db)
@@ -1,12 +1,12 @@
 from pydantic import EmailStr
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends
 
 from app.core.database import get_db
 from app.models.user import User
 from app.schemas.user import UserIn
-from app.utils.user import get_password_hash
+from app.utils.user import get_password_hash, verify_password
 
 
 class UserService:
@@ -14,6 +14,8 @@ class UserService:
         self.db = db
 
     async def create_user(self, user_in: UserIn):
+        # 앞선 중복 확인 조회의 트랜잭션을 끝내서 bcrypt 해싱 동안 커넥션을 풀에 돌려준다.
+        await self.db.close()
         hashed_password = await get_password_hash(user_in.password1)
         db_user = User(
             email=str(user_in.email),
@@ -22,8 +24,8 @@ class UserService:
         )
 
         self.db.add(db_user)
+        # refresh 하지 않는다: id 는 INSERT 결과로, created_at 등은 파이썬 쪽 default 로 이미 채워져 있다.
         await self.db.commit()
-        await self.db.refresh(db_user)
 
         return db_user
 
@@ -37,5 +39,27 @@ class UserService:
         result = await self.db.execute(query)  # await 추가
         return result.scalar_one_or_none()
 
+    async def change_password(self, user_id: int, current_password: str, new_password: str) -> bool:
+        """현재 비밀번호가 맞으면 바꾸고 token_version 을 올려 기존 토큰을 모두 무효화한다. 틀리면 False"""
+        hashed = await self.db.scalar(select(User.password).where(User.id == user_id))
+        if hashed is None:
+            return False
+        # bcrypt 검증/해싱 동안 커넥션을 잡고 있지 않도록 읽기 트랜잭션을 먼저 끝낸다.
+        await self.db.close()
+        if not await verify_password(current_password, hashed):
+            return False
+        new_hashed = await get_password_hash(new_password)
+        await self.db.execute(
+            update(User).where(User.id == user_id)
+            .values(password=new_hashed, token_version=User.token_version + 1)
+        )
+        await self.db.commit()
+        return True
+
+    async def revoke_tokens(self, user_id: int):
+        """token_version 을 올려서 지금까지 발급된 이 사용자의 토큰을 모두 무효화한다. (모든 기기에서 로그아웃)"""
+        await self.db.execute(update(User).where(User.id == user_id).values(token_version=User.token_version + 1))
+        await self.db.commit()
+
 def get_user_service(db: AsyncSession = Depends(get_db)) -> 'UserService':
     return UserService(db)
\ No newline at end of file
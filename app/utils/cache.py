@@ -0,0 +1,71 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+""" 프로세스 내 TTL + LRU 캐시
+- 이벤트 루프(단일 스레드) 안에서만 사용한다. 메서드 안에 await 가 없으므로 별도 락이 필요 없다.
+- 워커(프로세스)마다 따로 존재하므로, 다른 워커의 변경은 TTL 이 지나야 반영된다.
+  그래서 TTL 은 짧게 두고, 정합성이 중요한 값은 호출한 쪽에서 버전 비교를 함께 한다.
+- tag: 같은 태그로 저장된 항목을 한 번에 무효화할 때 사용 (예: user_id 별 토큰들)
+"""
+
+
+class TTLCache:
+    def __init__(self, maxsize: int = 1024, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any, Hashable | None]] = OrderedDict()
+        self._tags: dict[Hashable, set[Hashable]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default=None):
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return default
+        expires_at, value, _ = item
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value, ttl: float | None = None, tag: Hashable | None = None):
+        if key in self._data:
+            self._remove(key)
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        self._data[key] = (time.monotonic() + ttl, value, tag)
+        if tag is not None:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._data) > self.maxsize:
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+
+    def delete(self, key: Hashable):
+        if key in self._data:
+            self._remove(key)
+
+    def invalidate_tag(self, tag: Hashable):
+        for key in list(self._tags.get(tag, ())):
+            self._remove(key)
+
+    def clear(self):
+        self._data.clear()
+        self._tags.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def _remove(self, key: Hashable):
+        _, _, tag = self._data.pop(key)
+        if tag is not None:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
@@ -0,0 +1,26 @@
+import hashlib
+
+""" ETag / If-None-Match 유틸
+상세 조회는 updated_at 과 카운터 몇 개만 읽는 가벼운 쿼리로 ETag 를 먼저 만들고,
+클라이언트가 보낸 If-None-Match 와 같으면 전체 그래프를 로드/직렬화하지 않고 304 를 돌려준다.
+"""
+
+
+def make_etag(*parts) -> str:
+    raw = "|".join("" if p is None else str(p) for p in parts)
+    return '"' + hashlib.sha1(raw.encode("utf-8")).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match 는 약한 비교(RFC 9110 13.1.2): W/ 접두사는 무시하고 비교한다."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
@@ -0,0 +1,39 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+""" 키셋(커서) 페이지네이션 유틸
+OFFSET page*size 는 건너뛰는 행을 모두 스캔한 뒤 버리기 때문에 뒤 페이지로 갈수록 느려진다.
+커서는 마지막으로 본 행의 정렬 키 (예: created_at, id) 를 담아서, 다음 페이지를
+WHERE (created_at, id) < (:created_at, :id) 로 인덱스에서 바로 이어 읽게 한다.
+클라이언트에게는 내용을 알 필요가 없는 불투명(opaque) 문자열로만 전달한다.
+"""
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(*values) -> str:
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise InvalidCursorError(cursor) from e
+    if not isinstance(payload, list) or len(payload) != size:
+        raise InvalidCursorError(cursor)
+    return payload
+
+
+def parse_cursor_datetime(value) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError) as e:
+        raise InvalidCursorError(value) from e
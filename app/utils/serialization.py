@@ -0,0 +1,42 @@
+from functools import lru_cache
+from typing import Any
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+""" 응답 직렬화 빠른 경로
+FastAPI 기본 경로: 핸들러 반환값(ORM) -> response_model 로 검증 -> dict 로 dump -> jsonable_encoder -> json.dumps
+빠른 경로: 스키마별로 한 번 만든 TypeAdapter 로 검증 -> pydantic-core 가 바로 JSON bytes 로 직렬화
+- 이미 스키마 인스턴스(검증된 모델)면 다시 검증하지 않는다.
+- 라우트의 response_model 은 OpenAPI 문서용으로 그대로 둔다. (Response 를 반환하면 FastAPI 는 재검증하지 않는다)
+"""
+
+
+@lru_cache(maxsize=None)
+def get_adapter(schema) -> TypeAdapter:
+    """스키마(모델, list[모델] 등)별 TypeAdapter. 코어 스키마 생성 비용이 크므로 캐시해서 재사용한다."""
+    return TypeAdapter(schema)
+
+
+class PydanticJSONResponse(Response):
+    """이미 직렬화된 JSON bytes 나 pydantic 모델을 그대로 내보내는 응답"""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return get_adapter(type(content)).dump_json(content)
+
+
+def dump_json(schema, content: Any) -> bytes:
+    """content(ORM 객체/dict/모델)를 schema 로 검증해서 JSON bytes 로 만든다."""
+    adapter = get_adapter(schema)
+    if not (isinstance(schema, type) and isinstance(content, schema)):
+        content = adapter.validate_python(content, from_attributes=True)
+    return adapter.dump_json(content)
+
+
+def json_response(schema, content: Any, *, status_code: int = 200, headers: dict | None = None) -> PydanticJSONResponse:
+    return PydanticJSONResponse(dump_json(schema, content), status_code=status_code, headers=headers)
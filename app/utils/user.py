@@ -1,5 +1,6 @@
-import asyncio
 from passlib.context import CryptContext
+
+from app.core.hashing import hashing_pool
 """ 아래의 순서대로, 
 pip install "bcrypt==4.0.1"  # 반드시 bcrypt==4.0.1로 설치해야 한다.
 pip install "passlib[bcrypt]"
@@ -10,10 +11,17 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # 미리 컴파일된 정규식 (알파벳, 숫자, 특수문자 포함 9~50자)
 # PASSWORD_REGEX = re.compile(r"^(?=.*[A-Za-z])(?=.*\d)(?=.*[!@#$%^&*?_=+-])[A-Za-z\d!@#$%^&*?_=+-]{9,50}$")
 
+def _hash_password(password: str) -> str:
+    # 해싱 프로세스 풀의 워커에서 실행되므로 pickle 가능한 모듈 수준 함수로 둔다.
+    return pwd_context.hash(password)
+
+def _verify_password(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
 async def get_password_hash(password: str) -> str:
-    # CPU 바운드 작업: 스레드 풀로 오프로드
-    return await asyncio.to_thread(pwd_context.hash, password)
+    # CPU 바운드 작업: 전용 해싱 프로세스 풀로 오프로드 (가득 차면 HashingPoolBusyError)
+    return await hashing_pool.run("hash", _hash_password, password)
 
 async def verify_password(plain_password: str, hashed_password: str) -> bool:
-    # CPU 바운드 작업: 스레드 풀로 오프로드
-    return await asyncio.to_thread(pwd_context.verify, plain_password, hashed_password)
\ No newline at end of file
+    # CPU 바운드 작업: 전용 해싱 프로세스 풀로 오프로드 (가득 차면 HashingPoolBusyError)
+    return await hashing_pool.run("verify", _verify_password, plain_password, hashed_password)
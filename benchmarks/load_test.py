@@ -0,0 +1,241 @@
+""" 부하 테스트 / 벤치마크
+실제 FastAPI 앱(main.app)을 프로세스 안에서(httpx ASGITransport) 띄우고 로컬 DB 를 대신 사용해서,
+데이터를 시드한 뒤 실제 라우트를 정해진 동시성으로 호출하고 p50/p95/p99, 처리량, 요청당 쿼리 수를 측정한다.
+
+    pip install httpx aiosqlite
+    python -m benchmarks.load_test --users 50 --questions 2000 --concurrency 1,8,32 --output bench.json
+
+- 기본 DB 는 async SQLite 파일(--db-url 로 MySQL 등 다른 DB 지정 가능, 이 경우 기존 테이블을 drop/create 하므로 전용 DB 를 사용할 것)
+- 결과는 JSON 으로 출력(--output)되므로 릴리스 간 회귀 비교에 사용한다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Svelte_FastAPI load test")
+    parser.add_argument("--db-url", default="sqlite+aiosqlite:///./bench.db")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--questions", type=int, default=1000)
+    parser.add_argument("--answers-per-question", type=int, default=5)
+    parser.add_argument("--votes-per-question", type=int, default=3)
+    parser.add_argument("--concurrency", default="1,8,32", help="쉼표로 구분한 동시성 수준")
+    parser.add_argument("--requests", type=int, default=200, help="시나리오/동시성 조합당 요청 수")
+    parser.add_argument("--scenarios", default="list,list_keyword,detail,vote,login,answer_create")
+    parser.add_argument("--skip-seed", action="store_true", help="이미 시드된 DB 를 재사용")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="결과 JSON 파일 경로 (없으면 stdout)")
+    return parser.parse_args(argv)
+
+
+ARGS = parse_args()
+
+# 앱 import 전에 DB 설정을 주입한다. (config 는 import 시점에 읽힌다)
+os.environ["DATABASE_URL"] = ARGS.db_url
+for _key in ("DB_TYPE", "DB_DRIVER", "DEV_DB_NAME", "DEV_DB_HOST", "DEV_DB_PORT", "DEV_DB_USER", "DEV_DB_PASSWORD",
+             "PROD_DB_NAME", "PROD_DB_HOST", "PROD_DB_PORT", "PROD_DB_USER", "PROD_DB_PASSWORD", "SECRET_KEY"):
+    os.environ.setdefault(_key, "bench")
+os.environ.setdefault("DEBUG_TRUE", "false")
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    sys.exit("benchmarks/load_test.py 를 실행하려면 httpx 가 필요합니다: pip install httpx")
+
+from sqlalchemy import event, insert
+
+from main import app
+from app.core.database import ASYNC_ENGINE, AsyncSessionLocal, Base
+from app.core.metrics import DB_CONN_HOLD
+from app.models.qua import Question, Answer
+from app.models.user import User, question_voter, answer_voter
+from app.services.question_service import QuestionService
+from app.services.search_service import SearchService
+from app.utils.user import pwd_context
+
+PASSWORD = "bench-password-1!"
+WORDS = ("fastapi", "svelte", "python", "database", "index", "cursor", "async", "파이썬", "질문", "답변", "성능", "캐시")
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+
+
+def _text(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+async def seed(rng: random.Random):
+    async with ASYNC_ENGINE.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    hashed = pwd_context.hash(PASSWORD)  # bcrypt 는 느리므로 한 번만 계산해서 재사용
+    now = datetime.now(timezone.utc)
+    async with AsyncSessionLocal() as session:
+        await session.execute(insert(User), [
+            {"id": i, "username": f"user{i}", "email": f"user{i}@example.com", "password": hashed,
+             "created_at": now, "updated_at": now}
+            for i in range(1, ARGS.users + 1)
+        ])
+        questions, answers, q_votes, a_votes = [], [], set(), set()
+        answer_id = 0
+        for qid in range(1, ARGS.questions + 1):
+            created = now - timedelta(minutes=ARGS.questions - qid)
+            questions.append({"id": qid, "subject": f"Q{qid} " + _text(rng, 4), "content": f"<p>{_text(rng, 30)}</p>",
+                              "author_id": rng.randint(1, ARGS.users), "created_at": created, "updated_at": created})
+            for _ in range(ARGS.answers_per_question):
+                answer_id += 1
+                answers.append({"id": answer_id, "question_id": qid, "content": f"<p>{_text(rng, 15)}</p>",
+                                "author_id": rng.randint(1, ARGS.users), "created_at": created, "updated_at": created})
+                a_votes.add((rng.randint(1, ARGS.users), answer_id))
+            for _ in range(ARGS.votes_per_question):
+                q_votes.add((rng.randint(1, ARGS.users), qid))
+        for start in range(0, len(questions), 1000):
+            await session.execute(insert(Question), questions[start:start + 1000])
+        for start in range(0, len(answers), 1000):
+            await session.execute(insert(Answer), answers[start:start + 1000])
+        if q_votes:
+            await session.execute(insert(question_voter), [{"user_id": u, "question_id": q} for u, q in q_votes])
+        if a_votes:
+            await session.execute(insert(answer_voter), [{"user_id": u, "answer_id": a} for u, a in a_votes])
+        await session.commit()
+
+        await QuestionService(session).recount_counters()
+        await SearchService(session).reindex_all()
+
+
+async def login(client, user_no: int) -> str:
+    r = await client.post("/apis/auth/login", data={"username": f"user{user_no}@example.com", "password": PASSWORD})
+    r.raise_for_status()
+    return r.json()["access_token"]
+
+
+def build_scenarios(rng: random.Random, tokens: dict[int, str]):
+    def auth(user_no):
+        return {"Authorization": f"Bearer {tokens[user_no]}"}
+
+    def any_user():
+        return rng.choice(list(tokens))
+
+    return {
+        "list": lambda c: c.get("/apis/questions/all", params={"page": rng.randint(0, 20), "size": 10}),
+        "list_keyword": lambda c: c.get("/apis/questions/all", params={"page": 0, "size": 10, "keyword": rng.choice(WORDS)}),
+        "detail": lambda c: c.get(f"/apis/questions/detail/{rng.randint(1, ARGS.questions)}"),
+        "vote": lambda c: c.post(f"/apis/questions/vote/{rng.randint(1, ARGS.questions)}", headers=auth(any_user())),
+        "login": lambda c: c.post("/apis/auth/login", data={"username": f"user{any_user()}@example.com", "password": PASSWORD}),
+        "answer_create": lambda c: c.post(f"/apis/answers/post/{rng.randint(1, ARGS.questions)}",
+                                          json={"content": f"<p>{_text(rng, 10)}</p>"}, headers=auth(any_user())),
+    }
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+async def run_scenario(client, make_request, concurrency: int, total: int, counter: QueryCounter) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    remaining = total
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            response = await make_request(client)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    queries_before = counter.count
+    hold_before = DB_CONN_HOLD.snapshot()["sum"]
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "elapsed_s": round(elapsed, 4),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        "queries_per_request": round((counter.count - queries_before) / len(latencies), 2) if latencies else 0.0,
+        "conn_hold_ms_per_request": round((DB_CONN_HOLD.snapshot()["sum"] - hold_before) / len(latencies) * 1000, 3)
+        if latencies else 0.0,
+    }
+
+
+async def main():
+    try:
+        await _main()
+    finally:
+        await ASYNC_ENGINE.dispose()
+
+
+async def _main():
+    rng = random.Random(ARGS.seed)
+    if not ARGS.skip_seed:
+        seed_start = time.perf_counter()
+        await seed(rng)
+        print(f"seeded in {time.perf_counter() - seed_start:.1f}s", file=sys.stderr)
+
+    counter = QueryCounter()
+    event.listen(ASYNC_ENGINE.sync_engine, "after_cursor_execute", counter)
+
+    levels = [int(x) for x in ARGS.concurrency.split(",") if x.strip()]
+    selected = [s.strip() for s in ARGS.scenarios.split(",") if s.strip()]
+    results = []
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)  # 500 은 에러로 집계
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            token_users = range(1, min(ARGS.users, 20) + 1)
+            tokens = {u: await login(client, u) for u in token_users}
+            scenarios = build_scenarios(rng, tokens)
+            for name in selected:
+                for level in levels:
+                    result = await run_scenario(client, scenarios[name], level, ARGS.requests, counter)
+                    result["scenario"] = name
+                    results.append(result)
+                    print(f"{name:>14} c={level:<3} p50={result['p50_ms']:>8.2f}ms p95={result['p95_ms']:>8.2f}ms "
+                          f"p99={result['p99_ms']:>8.2f}ms rps={result['throughput_rps']:>8.1f} "
+                          f"q/req={result['queries_per_request']:>5.1f} hold={result['conn_hold_ms_per_request']:>7.2f}ms "
+                          f"err={result['errors']}", file=sys.stderr)
+
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "db_url": ARGS.db_url.split("@")[-1],
+        "dataset": {"users": ARGS.users, "questions": ARGS.questions,
+                    "answers_per_question": ARGS.answers_per_question, "votes_per_question": ARGS.votes_per_question},
+        "results": results,
+    }
+    payload = json.dumps(report, ensure_ascii=False, indent=2)
+    if ARGS.output:
+        with open(ARGS.output, "w", encoding="utf-8") as f:
+            f.write(payload)
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,95 @@
+""" 응답 직렬화 마이크로벤치마크
+답변 100개(답변마다 추천자 5명)가 달린 질문 한 건을 QuestionOut 으로 내보내는 비용을 비교한다. DB 는 사용하지 않는다.
+
+    python -m benchmarks.serialization --answers 100 --rounds 200
+
+- fastapi: 핸들러가 ORM 을 반환 -> FastAPI serialize_response(검증 + dump) -> JSONResponse(json.dumps)
+- fastapi+manual: 핸들러에서 model_validate 후 반환 -> FastAPI 가 한 번 더 검증 (기존 update_answer 방식)
+- fast_path: app.utils.serialization.dump_json (캐시된 TypeAdapter 로 검증 + pydantic-core JSON 직렬화)
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+for _key in ("DB_TYPE", "DB_DRIVER", "DEV_DB_NAME", "DEV_DB_HOST", "DEV_DB_PORT", "DEV_DB_USER", "DEV_DB_PASSWORD",
+             "PROD_DB_NAME", "PROD_DB_HOST", "PROD_DB_PORT", "PROD_DB_USER", "PROD_DB_PASSWORD", "SECRET_KEY"):
+    os.environ.setdefault(_key, "bench")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("DEBUG_TRUE", "false")
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.models.qua import Question, Answer
+from app.models.user import User
+from app.schemas.question import QuestionOut
+from app.utils.serialization import dump_json
+
+
+def build_thread(answer_count: int, voters_per_answer: int = 5) -> Question:
+    now = datetime.now(timezone.utc)
+    users = [User(id=i, username=f"user{i}", email=f"user{i}@example.com") for i in range(1, 51)]
+    question = Question(id=1, subject="벤치마크 질문", content="<p>" + "본문 " * 200 + "</p>",
+                        created_at=now, updated_at=now, author=users[0], voter=users[:10],
+                        vote_count=10, answer_count=answer_count)
+    question.answers_all = [
+        Answer(id=i, question_id=1, content=f"<p>{'답변 내용 ' * 40}{i}</p>",
+               created_at=now + timedelta(seconds=i), updated_at=now + timedelta(seconds=i),
+               author=users[i % len(users)], voter=users[i % 40:i % 40 + voters_per_answer],
+               vote_count=voters_per_answer)
+        for i in range(1, answer_count + 1)
+    ]
+    return question
+
+
+def measure(func, rounds: int) -> list[float]:
+    func()  # 워밍업 (스키마/어댑터 생성 비용 제외)
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="QuestionOut 직렬화 마이크로벤치마크")
+    parser.add_argument("--answers", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    question = build_thread(args.answers)
+    field = create_model_field(name="Response_QuestionOut", type_=QuestionOut, mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    def fastapi_default(content=question):
+        data = loop.run_until_complete(serialize_response(field=field, response_content=content, is_coroutine=True))
+        return JSONResponse(data).body
+
+    def fastapi_manual():
+        return fastapi_default(QuestionOut.model_validate(question, from_attributes=True))
+
+    def fast_path():
+        return dump_json(QuestionOut, question)
+
+    assert JSONResponse.render(None, QuestionOut.model_validate_json(fast_path()).model_dump(mode="json")) \
+        == fastapi_default(), "직렬화 결과가 달라졌습니다."
+
+    results = {}
+    for name, func in (("fastapi", fastapi_default), ("fastapi+manual", fastapi_manual), ("fast_path", fast_path)):
+        samples = measure(func, args.rounds)
+        results[name] = statistics.median(samples)
+        print(f"{name:>15}: median {results[name] * 1000:8.3f}ms  p95 {sorted(samples)[int(len(samples) * 0.95) - 1] * 1000:8.3f}ms  "
+              f"({len(fast_path())} bytes)", file=sys.stderr)
+    print(f"fast_path speedup: {results['fastapi'] / results['fast_path']:.2f}x vs fastapi, "
+          f"{results['fastapi+manual'] / results['fast_path']:.2f}x vs fastapi+manual", file=sys.stderr)
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
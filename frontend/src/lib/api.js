@@ -43,7 +43,8 @@ const fastapi = (operation, url, params, success_callback, failure_callback) =>
         method: method,
         headers: {
             "Content-Type": content_type
-        }
+        },
+        credentials: 'include'  // 쓰기 직후 GET 을 primary 로 읽도록 서버가 붙이는 쿠키(read_primary_until)를 보낸다.
     };
 
     const _access_token = get(access_token);
@@ -12,6 +12,7 @@ const persist_storage = (key, initValue) => {
 export const page = persist_storage("page", 0);
 
 export const keyword = persist_storage("keyword", "");
+export const sort = persist_storage("sort", "recent");
 
 export const access_token = persist_storage("access_token", "");
 export const username = persist_storage("username", "");
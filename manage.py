@@ -0,0 +1,138 @@
+""" 운영/관리용 커맨드
+    python manage.py reindex-search   # 질문 검색 문서 전체 재생성
+    python manage.py recount          # vote_count / answer_count 재집계
+    python manage.py purge-deleted    # 소프트 삭제된 질문 실제 삭제
+    python manage.py export -o questions.ndjson   # 질문/답변/추천 수 NDJSON 내보내기 (-o 없으면 stdout)
+    python manage.py import legacy.ndjson --checkpoint legacy.ckpt   # NDJSON 일괄 가져오기 (중단 시 이어서 실행)
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+from app.core.config import get_config
+from app.core.database import AsyncSessionLocal, ASYNC_ENGINE, use_primary
+
+
+async def reindex_search(args):
+    from app.services.search_service import SearchService
+
+    async with AsyncSessionLocal() as session:
+        use_primary(session) # 관리 작업은 복제 지연 없이 primary 기준으로
+        count = await SearchService(session).reindex_all(batch_size=args.batch_size)
+    print(f"reindexed {count} questions")
+
+
+async def recount(args):
+    from app.services.question_service import QuestionService
+
+    async with AsyncSessionLocal() as session:
+        use_primary(session) # 관리 작업은 복제 지연 없이 primary 기준으로
+        questions, answers = await QuestionService(session).recount_counters()
+    print(f"recounted: {questions} questions, {answers} answers fixed")
+
+
+async def purge_deleted(args):
+    from app.services.question_service import QuestionService
+
+    async with AsyncSessionLocal() as session:
+        use_primary(session)
+        purged = await QuestionService(session).purge_deleted_questions(batch_size=args.batch_size)
+    print(f"purged {purged} questions")
+
+
+async def export(args):
+    from app.services.export_service import ExportService
+
+    # 오래 걸리는 읽기 전용 작업이므로 복제본이 있으면 복제본에서 읽는다. (use_primary 하지 않음)
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        async with AsyncSessionLocal() as session:
+            async for chunk in ExportService(session).export_ndjson(batch_size=args.batch_size):
+                out.write(chunk)
+    finally:
+        if args.output:
+            out.close()
+        else:
+            out.flush()
+
+
+async def import_ndjson(args):
+    from app.core.hashing import hashing_pool
+    from app.services.import_service import ImportService
+
+    skip_lines = 0
+    if args.checkpoint and os.path.exists(args.checkpoint):
+        with open(args.checkpoint) as f:
+            skip_lines = json.load(f)["committed_lines"]
+        print(f"resuming after line {skip_lines}", file=sys.stderr)
+
+    async def save_checkpoint(report):
+        print(f"committed {report.committed_lines} lines, {report.rows_per_sec} rows/sec", file=sys.stderr)
+        if args.checkpoint:
+            # 쓰는 도중 중단돼도 이전 체크포인트가 남도록 임시 파일에 쓰고 교체한다.
+            with open(args.checkpoint + ".tmp", "w") as f:
+                json.dump({"committed_lines": report.committed_lines}, f)
+            os.replace(args.checkpoint + ".tmp", args.checkpoint)
+
+    async def read_lines():
+        with open(args.file, "rb") as f:
+            for line in f:
+                yield line
+
+    config = get_config()
+    if config.HASH_POOL_SIZE > 0:
+        hashing_pool.start(config.HASH_POOL_SIZE, config.HASH_POOL_QUEUE_SIZE)
+    try:
+        async with AsyncSessionLocal() as session:
+            use_primary(session)
+            report = await ImportService(session).import_ndjson(read_lines(), batch_size=args.batch_size,
+                                                                skip_lines=skip_lines,
+                                                                on_checkpoint=save_checkpoint)
+    finally:
+        hashing_pool.stop()
+    print(report.model_dump_json(indent=2))
+    if report.aborted:
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Svelte_FastAPI 관리 커맨드")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    reindex = subparsers.add_parser("reindex-search", help="질문 검색 문서 전체 재생성")
+    reindex.add_argument("--batch-size", type=int, default=500)
+    reindex.set_defaults(func=reindex_search)
+
+    recount_parser = subparsers.add_parser("recount", help="vote_count / answer_count 재집계")
+    recount_parser.set_defaults(func=recount)
+
+    purge = subparsers.add_parser("purge-deleted", help="소프트 삭제된 질문 실제 삭제")
+    purge.add_argument("--batch-size", type=int, default=1000)
+    purge.set_defaults(func=purge_deleted)
+
+    export_parser = subparsers.add_parser("export", help="질문/답변/추천 수 NDJSON 내보내기")
+    export_parser.add_argument("-o", "--output", help="출력 파일 (없으면 stdout)")
+    export_parser.add_argument("--batch-size", type=int, default=1000)
+    export_parser.set_defaults(func=export)
+
+    import_parser = subparsers.add_parser("import", help="NDJSON 일괄 가져오기 (사용자, 질문+답변)")
+    import_parser.add_argument("file")
+    import_parser.add_argument("--batch-size", type=int, default=1000)
+    import_parser.add_argument("--checkpoint", help="commit 한 줄 수를 기록할 파일 (있으면 그 다음 줄부터 이어서)")
+    import_parser.set_defaults(func=import_ndjson)
+
+    args = parser.parse_args()
+
+    async def run():
+        try:
+            await args.func(args)
+        finally:
+            await ASYNC_ENGINE.dispose()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()